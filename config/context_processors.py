@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, TypedDict
 from django.http import HttpRequest
-from django.urls import reverse_lazy
+from django.urls import get_script_prefix, reverse
+from django.utils.functional import SimpleLazyObject
+
+ANONYMOUS, USER, STAFF = "anonymous", "user", "staff"
 
 
 class Tile(TypedDict):
@@ -19,12 +23,21 @@ class SectionItem(TypedDict):
     items: List[Tile]
 
 
-def navigation_tiles(request: HttpRequest) -> dict:
-    user = getattr(request, "user", None)
+def _role(user) -> str:
+    if not getattr(user, "is_authenticated", False):
+        return ANONYMOUS
+    return STAFF if getattr(user, "is_staff", False) else USER
+
 
+@lru_cache(maxsize=None)
+def _sections(role: str, script_prefix: str) -> List[SectionItem]:
+    """
+    Tiles pro Rolle, URLs fertig aufgelöst. `script_prefix` (FORCE_SCRIPT_NAME) ist Teil
+    des Schlüssels, weil reverse() ihn voranstellt. Ergebnis nicht verändern (geteilt).
+    """
     # Nicht eingeloggt → nichts anzeigen
-    if not getattr(user, "is_authenticated", False):
-        return {"sections": []}
+    if role == ANONYMOUS:
+        return []
 
     sections: List[SectionItem] = []
 
@@ -38,7 +51,7 @@ def navigation_tiles(request: HttpRequest) -> dict:
                     "description": "Alle Tickets anzeigen und nach Veranstaltung filtern.",
                     "icon": "bi-ticket-perforated",
                     "color": "text-primary",
-                    "url": reverse_lazy("tickets_list"),
+                    "url": reverse("tickets_list"),
                     "nav": True,
                 },
                 {
@@ -46,7 +59,7 @@ def navigation_tiles(request: HttpRequest) -> dict:
                     "description": "Alle Teilnehmer anzeigen und nach Veranstaltung filtern.",
                     "icon": "bi-people-fill",
                     "color": "text-primary",
-                    "url": reverse_lazy("participants_list"),
+                    "url": reverse("participants_list"),
                     "nav": True,
                 },
                 {
@@ -54,7 +67,15 @@ def navigation_tiles(request: HttpRequest) -> dict:
                     "description": "Umsatz, KPIs und Auslastung.",
                     "icon": "bi-speedometer2",
                     "color": "text-info",
-                    "url": reverse_lazy("analytics_dashboard"),
+                    "url": reverse("analytics_dashboard"),
+                    "nav": True,
+                },
+                {
+                    "title": "Saison-Auswertung",
+                    "description": "Wiederkehrer, Kohorten und Ticket-Konversion.",
+                    "icon": "bi-graph-up-arrow",
+                    "color": "text-info",
+                    "url": reverse("analytics_season_report"),
                     "nav": True,
                 },
             ],
@@ -62,7 +83,7 @@ def navigation_tiles(request: HttpRequest) -> dict:
     )
 
     # NUR für Staff
-    if getattr(user, "is_staff", False):
+    if role == STAFF:
         sections.append(
             {
                 "section": "Admin",
@@ -72,7 +93,7 @@ def navigation_tiles(request: HttpRequest) -> dict:
                         "description": "CSV-Export vom Eventmanager importieren.",
                         "icon": "bi-cloud-upload",
                         "color": "text-primary",
-                        "url": reverse_lazy("import"),
+                        "url": reverse("import"),
                         "nav": True,
                     },
                     {
@@ -80,11 +101,20 @@ def navigation_tiles(request: HttpRequest) -> dict:
                         "description": "Direkter Zugriff auf das Admin Interface.",
                         "icon": "bi-gear-fill",
                         "color": "text-dark",
-                        "url": reverse_lazy("admin:index"),
+                        "url": reverse("admin:index"),
                         "nav": True,
                     },
                 ],
             }
         )
 
-    return {"sections": sections}
+    return sections
+
+
+def navigation_tiles(request: HttpRequest) -> dict:
+    # Lazy: Templates ohne `sections` (Partials, Fehlerseiten) lösen weder User noch Tiles auf
+    return {
+        "sections": SimpleLazyObject(
+            lambda: _sections(_role(getattr(request, "user", None)), get_script_prefix())
+        )
+    }
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.forms',
     'crispy_forms',
     'crispy_bootstrap5',
     'gfm',
@@ -43,21 +45,77 @@ INSTALLED_APPS = [
 
 AUTH_USER_MODEL = "gfm.User"
 
+# User pro Request aus dem Cache statt aus der DB (Invalidierung über gfm.signals).
+# ModelBackend bleibt dahinter: Sessions von vor der Umstellung verweisen noch darauf.
+AUTHENTICATION_BACKENDS = [
+    "gfm.auth.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Sessions aus dem Cache, Schreibzugriffe gehen zusätzlich in die DB (übersteht Cache-Leerung).
+# GFM_SESSION=signed_cookies legt sie stattdessen signiert im Cookie ab (ganz ohne Speicher).
+SESSION_ENGINE = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[os.environ.get('GFM_SESSION', 'cached_db')]
+
 MIDDLEWARE = [
+    # Zuerst: misst alles Folgende (gfm.perf, Server-Timing + Slow-Request-Log)
+    'gfm.perf.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Cache-Versionen einmal pro Request lesen (gfm.cache, Invalidierung zwischen Workern)
+    'gfm.cache.CacheVersionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Zuletzt: profiliert einzelne Requests auf Abruf (nur Staff, ?_profile=1)
+    'gfm.perf.ProfileMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# Performance-Messung pro Request (gfm.perf): Server-Timing-Header und eine JSON-Zeile
+# pro Request im Log gfm.perf; ab GFM_PERF_SLOW_MS zusätzlich im Admin unter "Slow requests".
+# GFM_PERF=0 nimmt die Middleware ganz aus der Kette.
+GFM_PERF = os.environ.get('GFM_PERF', '1').lower() in ('1', 'true', 'yes')
+GFM_PERF_SLOW_MS = int(os.environ.get('GFM_PERF_SLOW_MS', 500))
+
+# Live-Listen (gfm.views.LiveDeltaMixin): so viele Sekunden liefert jede Abfrage Zeilen vor dem
+# letzten Stand erneut. updated_at wird vor dem Warten auf die Schreibsperre bzw. lange vor dem
+# Commit gesetzt; mindestens busy_timeout (SQLITE_PRAGMAS) wird automatisch eingehalten.
+GFM_LIVE_OVERLAP = int(os.environ.get('GFM_LIVE_OVERLAP', 30))
+
+# Prometheus-Metriken unter /metrics/ (gfm.metrics). GFM_METRICS_DIR: gemeinsames Verzeichnis,
+# über das mehrere Worker ihre Zähler zusammenführen (ohne: nur der abgerufene Prozess).
+# GFM_METRICS_TOKEN: Abruf mit "Authorization: Bearer <token>", sonst nur Staff-Login.
+GFM_METRICS_DIR = os.environ.get('GFM_METRICS_DIR') or None
+GFM_METRICS_TOKEN = os.environ.get('GFM_METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'perf': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'gfm.perf': {
+            'handlers': ['perf'],
+            'level': os.environ.get('GFM_PERF_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates mit Renderzeit für gfm.perf
+        'BACKEND': 'gfm.perf.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -71,6 +129,9 @@ TEMPLATES = [
     },
 ]
 
+# Formular-Templates (z.B. ParticipationSelectionForm) liegen unter templates/
+FORM_RENDERER = 'django.forms.renderers.TemplatesSetting'
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
@@ -80,7 +141,85 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Schreibsperre gleich bei BEGIN holen: wartet dann per busy_timeout,
+            # statt beim späteren Upgrade von Lesen auf Schreiben sofort "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# PostgreSQL statt SQLite, sobald GFM_DB_NAME gesetzt ist (siehe README)
+if os.environ.get('GFM_DB_NAME'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['GFM_DB_NAME'],
+            'USER': os.environ.get('GFM_DB_USER', ''),
+            'PASSWORD': os.environ.get('GFM_DB_PASSWORD', ''),
+            'HOST': os.environ.get('GFM_DB_HOST', ''),
+            'PORT': os.environ.get('GFM_DB_PORT', ''),
+            # Verbindung vor Wiederverwendung prüfen (Neustart der DB, Idle-Timeouts)
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('GFM_DB_POOL', '').lower() in ('1', 'true', 'yes'):
+        # psycopg-Pool pro Worker-Prozess; schließt persistente Verbindungen (CONN_MAX_AGE) aus
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('GFM_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('GFM_DB_POOL_MAX', 10)),
+            'timeout': 10,
+        }
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+    else:
+        # Persistente Verbindung pro Worker (Sekunden, None = unbegrenzt)
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('GFM_DB_CONN_MAX_AGE', 60))
+
+# Cache (siehe README): GFM_CACHE=locmem (pro Prozess, Entwicklung), file oder sqlite.
+# file/sqlite teilen sich alle Gunicorn-Worker eines Hosts; sqlite liegt in einer eigenen
+# Datei (Cache-Schreibzugriffe konkurrieren nicht mit der Schreibsperre von db.sqlite3)
+# und braucht einmal `python manage.py createcachetable`.
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gfm',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('GFM_CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    },
+    'sqlite': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'gfm_cache',
+    },
+}
+GFM_CACHE = os.environ.get('GFM_CACHE', 'locmem')
+
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[GFM_CACHE],
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+if GFM_CACHE == 'sqlite':
+    DATABASES['cache'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('GFM_CACHE_LOCATION', str(BASE_DIR / 'cache.sqlite3')),
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
+    DATABASE_ROUTERS = ['gfm.db.CacheRouter']
+
+# SQLite-Verbindungsprofil, wird bei jeder neuen Verbindung gesetzt (gfm.signals)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',       # Leser blockieren Schreiber nicht mehr
+    'busy_timeout': 5000,        # ms warten statt sofort "database is locked"
+    'synchronous': 'NORMAL',     # in WAL sicher, fsync nur beim Checkpoint
+    'cache_size': -20000,        # negativ = KiB (ca. 20 MB Page-Cache pro Verbindung)
+    'mmap_size': 134217728,      # 128 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
 }
 
 # Password validation
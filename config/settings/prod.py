@@ -1,3 +1,5 @@
+import os
+
 from .base import *
 
 DEBUG = False
@@ -9,6 +11,12 @@ FORCE_SCRIPT_NAME = "/gfm"
 STATIC_URL = "static/"
 STATIC_ROOT = "/srv/django/gfm/staticfiles"
 
+# collectstatic: gehashte Dateinamen (far-future Caching in nginx) + .gz/.br-Varianten
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "gfm.storage.CompressedManifestStaticFilesStorage"},
+}
+
 # Reverse Proxy / SSL
 USE_X_FORWARDED_HOST = True
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
@@ -25,4 +33,23 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = "DENY"
 
 SECURE_HSTS_SECONDS = 3600
-SECURE_HSTS_INCLUDE_SUBDOMAINS = False
\ No newline at end of file
+SECURE_HSTS_INCLUDE_SUBDOMAINS = False
+
+# Gemeinsamer Cache für alle Gunicorn-Worker (Invalidierung über Signals muss alle erreichen);
+# ohne GFM_CACHE dateibasiert, GFM_CACHE=sqlite wie in base.py
+if "GFM_CACHE" not in os.environ:
+    CACHES["default"].update(
+        BACKEND="django.core.cache.backends.filebased.FileBasedCache",
+        LOCATION=os.environ.get("GFM_CACHE_LOCATION", "/srv/django/gfm/cache"),
+    )
+
+# Metriken aller Gunicorn-Worker zusammenführen (siehe gfm.metrics)
+GFM_METRICS_DIR = os.environ.get("GFM_METRICS_DIR", "/srv/django/gfm/metrics")
+
+# SQLite unter mehreren Gunicorn-Workern: länger auf Schreibsperre warten, größerer Cache
+SQLITE_PRAGMAS = {
+    **SQLITE_PRAGMAS,
+    "busy_timeout": 15000,
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+}
@@ -1,28 +1,110 @@
+import re
+import uuid
+
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 from gfm.models import User
 from django.utils.translation import gettext_lazy as _
 
 from django.contrib import admin, messages
-from django.db import transaction
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+
+from . import perf
+from .cache import bump_data_version
+from .models import Event, EventStats, Participant, RequestProfile, SlowRequest, Ticket
+from .participation import invalidate_participation_summary
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Ungefilterte Changelists großer Tabellen zählen nicht per COUNT(*), sondern
+    schätzen (SQLite: MAX(rowid), PostgreSQL: pg_class.reltuples).
+    Gefilterte Listen und kleine Tabellen werden weiterhin exakt gezählt.
+    """
+
+    EXACT_BELOW = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            estimate = self._estimate(self.object_list.model._meta.db_table)
+            if estimate is not None and estimate >= self.EXACT_BELOW:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(table: str):
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}")
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class RecentEventFilter(admin.SimpleListFilter):
+    """
+    Nur die letzten Events als Filter (statt alle Events zu laden);
+    ältere über die Autocomplete-Suche bzw. ?event__id__exact=.
+    """
+
+    title = "Event"
+    parameter_name = "event__id__exact"
+    LIMIT = 20
+
+    def lookups(self, request, model_admin):
+        events = Event.objects.order_by("-date", "-id")[: self.LIMIT]
+        return [(str(e.pk), str(e)) for e in events]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(event_id=self.value())
+        return queryset
 
-from .models import Event, Participant, Ticket
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("name", "date", "tickets_count", "participants_count")
     search_fields = ("name",)
     list_filter = ("date",)
     date_hierarchy = "date"
     ordering = ("-date", "name")
+    # Zähler aus dem Rollup (EventStats), keine COUNT-Abfragen pro Zeile
+    list_select_related = ("stats",)
+
+    @staticmethod
+    def _stats(obj: Event):
+        try:
+            return obj.stats
+        except EventStats.DoesNotExist:
+            return None
 
-    @admin.display(description="Tickets")
+    @admin.display(description="Tickets", ordering="stats__tickets")
     def tickets_count(self, obj: Event) -> int:
-        return obj.tickets.count()
+        stats = self._stats(obj)
+        return stats.tickets if stats else 0
 
-    @admin.display(description="Participants")
+    @admin.display(description="Participants", ordering="stats__participants")
     def participants_count(self, obj: Event) -> int:
-        return obj.participants.count()
+        stats = self._stats(obj)
+        return stats.participants if stats else 0
 
 
 class HasParticipantFilter(admin.SimpleListFilter):
@@ -44,7 +126,7 @@ class HasParticipantFilter(admin.SimpleListFilter):
         return queryset
 
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "ticket_uuid",
         "name",
@@ -54,9 +136,53 @@ class TicketAdmin(admin.ModelAdmin):
         "created_at",
     )
     search_fields = ("ticket_uuid", "name", "email", "event__name")
-    list_filter = ("event", HasParticipantFilter, "created_at")
+    list_filter = (RecentEventFilter, HasParticipantFilter, "created_at")
     autocomplete_fields = ("event",)
     readonly_fields = ("ticket_uuid", "created_at", "updated_at")
+    # Participant.__str__ zeigt dessen Event mit an
+    list_select_related = ("event", "participant__event")
+
+    # Kappt auch das Nachladen von select2: nach AUTOCOMPLETE_LIMIT Treffern
+    # meldet die Autocomplete-Seite kein "more" mehr, der Rest ist nur per Suchbegriff erreichbar
+    AUTOCOMPLETE_LIMIT = 50
+    _UUID_PREFIX = re.compile(r"^[0-9a-f]{4,32}$")
+
+    def get_search_results(self, request, queryset, search_term):
+        if getattr(request.resolver_match, "url_name", None) != "autocomplete":
+            return super().get_search_results(request, queryset, search_term)
+        return self._autocomplete_results(request, queryset, search_term), False
+
+    def _autocomplete_results(self, request, queryset, search_term):
+        """
+        Autocomplete (z.B. Participant.ticket) ohne icontains-Scans:
+        - Präfix auf Name/E-Mail -> Bereich auf lower(name)/lower(email) (Funktions-Indizes);
+          auch der Suchbegriff wird in der DB gefaltet, damit beide Seiten gleich behandelt
+          werden (SQLite faltet nur ASCII: "Ü" findet "Über", "ü" nicht)
+        - UUID-Präfix -> Bereich auf dem Primärschlüssel
+        - auf das Event des Participants eingeschränkt (?event=, siehe ticket_autocomplete.js)
+        - höchstens AUTOCOMPLETE_LIMIT Treffer
+        """
+        qs = queryset.select_related("event")
+
+        event_id = request.GET.get("event", "")
+        if event_id.isdigit():
+            qs = qs.filter(event_id=int(event_id))
+
+        term = search_term.strip()
+        if term:
+            lower, upper = Lower(Value(term)), Lower(Value(term + "\uffff"))
+            match = Q(name_lower__gte=lower, name_lower__lt=upper) | Q(email_lower__gte=lower, email_lower__lt=upper)
+            # Hex-Eingaben können auch ein Namensanfang sein ("dede") -> beides zulassen
+            hex_term = term.lower().replace("-", "")
+            if self._UUID_PREFIX.match(hex_term):
+                match |= Q(
+                    ticket_uuid__gte=uuid.UUID(hex_term.ljust(32, "0")),
+                    ticket_uuid__lte=uuid.UUID(hex_term.ljust(32, "f")),
+                )
+            qs = qs.alias(name_lower=Lower("name"), email_lower=Lower("email")).filter(match)
+
+        qs = qs.order_by(Lower("name"), "ticket_uuid")
+        return qs[: self.AUTOCOMPLETE_LIMIT]
 
     @admin.display(description="Participant")
     def linked_participant(self, obj: Ticket):
@@ -86,24 +212,12 @@ class LinkedTicketFilter(admin.SimpleListFilter):
 @admin.action(description="Auto-link Tickets for selected Participants")
 def action_autolink_tickets(modeladmin, request, queryset):
     """
-    Triggert das Autolinking (Participant.save() macht den Match),
-    sinnvoll wenn z.B. Tickets nachträglich importiert wurden.
+    Triggert das Autolinking (Participant.objects.autolink, gleiche Logik wie
+    die Drill-down-Liste "Zahler ohne Ticket").
     """
-    updated = 0
-    skipped = 0
-
-    with transaction.atomic():
-        # Sperren für konsistente Verknüpfung bei parallelen Admin-Operationen
-        qs = queryset.select_for_update()
-        for p in qs:
-            if p.ticket_id:
-                skipped += 1
-                continue
-
-            before = p.ticket_id
-            p.save()  # ruft _try_autolink_ticket() aus models.py auf
-            if before != p.ticket_id and p.ticket_id:
-                updated += 1
+    stats = Participant.objects.autolink(queryset)
+    updated = stats["linked"]
+    skipped = stats["skipped"]
 
     if updated:
         modeladmin.message_user(
@@ -130,7 +244,13 @@ def action_unlink_tickets(modeladmin, request, queryset):
     """
     Entfernt Verknüpfungen (nur wenn du das fachlich erlauben willst).
     """
-    count = queryset.filter(ticket__isnull=False).update(ticket=None)
+    linked = queryset.filter(ticket__isnull=False)
+    # update() feuert keine Signals -> Teilnahme-Übersichten selbst invalidieren
+    rows = list(linked.values_list("email", "event_id", "ticket__event_id"))
+    count = linked.update(ticket=None)
+    invalidate_participation_summary(*{email for email, _, _ in rows})
+    EventStats.objects.rebuild(event_ids={e for _, *ids in rows for e in ids})
+    bump_data_version()
     modeladmin.message_user(
         request,
         f"Unlinked Tickets from {count} Participant(s).",
@@ -139,7 +259,7 @@ def action_unlink_tickets(modeladmin, request, queryset):
 
 
 @admin.register(Participant)
-class ParticipantAdmin(admin.ModelAdmin):
+class ParticipantAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "name",
         "email",
@@ -150,11 +270,16 @@ class ParticipantAdmin(admin.ModelAdmin):
         "created_at",
     )
     search_fields = ("name", "email", "event__name", "ticket__ticket_uuid", "ticket__name")
-    list_filter = ("event", LinkedTicketFilter, "paid_at", "created_at")
+    list_filter = (RecentEventFilter, LinkedTicketFilter, "paid_at", "created_at")
     autocomplete_fields = ("event", "ticket")
     readonly_fields = ("created_at", "updated_at")
     actions = (action_autolink_tickets, action_unlink_tickets)
-    list_select_related = ("event", "ticket")
+    # Ticket.__str__ zeigt dessen Event mit an
+    list_select_related = ("event", "ticket__event")
+
+    class Media:
+        # Ticket-Autocomplete auf das gewählte Event einschränken
+        js = ("admin/js/jquery.init.js", "gfm_admin/ticket_autocomplete.js")
 
     fieldsets = (
         ("Participant", {"fields": ("name", "email", "event")}),
@@ -165,7 +290,7 @@ class ParticipantAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related("event", "ticket")
+        return qs.select_related("event", "ticket__event")
 
     def save_model(self, request, obj, form, change):
         """
@@ -231,3 +356,100 @@ class UserAdmin(DjangoUserAdmin):
     )
 
     readonly_fields = ("date_joined", "last_login")
+
+
+@admin.register(SlowRequest)
+class SlowRequestAdmin(admin.ModelAdmin):
+    """
+    Fortlaufendes Protokoll langsamer Requests (gfm.perf); nur lesend.
+    """
+
+    list_display = ("created_at", "method", "path", "view", "status", "duration_ms", "db_ms", "queries", "template_ms")
+    list_filter = ("view", "status")
+    search_fields = ("path", "view")
+    date_hierarchy = "created_at"
+    fields = (
+        "created_at", "method", "path", "view", "status",
+        "duration_ms", "db_ms", "queries", "template_ms", "top_sql_table",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Top SQL")
+    def top_sql_table(self, obj):
+        if not obj.top_sql:
+            return "-"
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td><code>{}</code></td></tr>",
+            ((q["ms"], q["count"], q["sql"]) for q in obj.top_sql),
+        )
+        return format_html("<table><tr><th>ms</th><th>count</th><th>SQL</th></tr>{}</table>", rows)
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    cProfile-Mitschnitte auf Anfrage (gfm.perf, `?_profile=1` als Staff); nur lesend.
+    """
+
+    list_display = ("created_at", "method", "path", "view", "status", "duration_ms", "db_ms", "queries", "user")
+    list_filter = ("view",)
+    search_fields = ("path", "view")
+    date_hierarchy = "created_at"
+    fields = (
+        "created_at", "user", "method", "path", "view", "status", "duration_ms", "db_ms", "queries",
+        "download", "top_cumulative", "top_tottime",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="gfm_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise PermissionDenied
+        response = HttpResponse(bytes(profile.stats), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="profile-{profile.pk}.pstats"'
+        return response
+
+    @admin.display(description="Download")
+    def download(self, obj):
+        url = reverse("admin:gfm_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">profile-{}.pstats</a> (snakeviz, python -m pstats)', url, obj.pk)
+
+    def _top_table(self, obj, sort):
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td>{}</td><td><code>{}</code></td></tr>",
+            ((r["cumtime_ms"], r["tottime_ms"], r["calls"], r["function"]) for r in perf.top_functions(obj.stats, sort)),
+        )
+        return format_html(
+            "<table><tr><th>cumulative ms</th><th>own ms</th><th>calls</th><th>function</th></tr>{}</table>", rows
+        )
+
+    @admin.display(description="Top by cumulative time")
+    def top_cumulative(self, obj):
+        return self._top_table(obj, "cumulative")
+
+    @admin.display(description="Top by own time")
+    def top_tottime(self, obj):
+        return self._top_table(obj, "tottime")
@@ -0,0 +1,342 @@
+"""
+Saison- und Kohorten-Auswertungen auf einem spaltenorientierten Frame.
+
+Participant/Ticket/Event werden je in einem einzigen values_list-Durchlauf in
+kompakte Spalten (array.array) geladen; E-Mails und Events sind dabei auf
+fortlaufende Ganzzahlen abgebildet. Die Reports rechnen nur noch auf diesen
+Spalten - mit NumPy vektorisiert, ohne NumPy über die gleichen Hilfsfunktionen
+in reinem Python.
+
+Der Frame wird pro Prozess gehalten. Nach einer Änderung des globalen
+Daten-Stands wird er erst neu geladen, wenn er älter als FRAME_MAX_AGE ist:
+ein Check-in lädt so nicht jedes Mal die ganze Saison neu.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+
+from gfm import cache
+from gfm.models import Event, Participant, Ticket
+
+try:
+    import numpy as np
+except ImportError:  # optional, die Reports funktionieren auch ohne
+    np = None
+
+CHUNK_SIZE = 5000
+# Sekunden, die ein Frame nach einer Änderung noch ausgeliefert wird
+FRAME_MAX_AGE = 300
+
+
+# ---------------------------------------------------------------------------
+# Spalten-Primitive (NumPy, falls vorhanden)
+#
+# Eine "Spalte" ist mit NumPy ein ndarray, ohne NumPy ein array.array. Die
+# Helfer nehmen und liefern Spalten; in Python-Listen gewandelt wird erst im
+# Report (`.tolist()` gibt es auf beiden).
+# ---------------------------------------------------------------------------
+
+def _column(col: array):
+    """
+    Geladene array-Spalte als Rechenspalte: mit NumPy eine Sicht ohne Kopie.
+    """
+    if np is None:
+        return col
+    if not len(col):
+        return np.zeros(0, dtype=col.typecode)
+    return np.frombuffer(col, dtype=np.dtype(col.typecode))
+
+
+def _counts(idx, size: int, weights=None, mask=None):
+    """
+    Summe (bzw. Anzahl) pro Index 0..size-1, optional nur für Zeilen mit mask=1.
+    """
+    if np is not None:
+        if mask is not None:
+            keep = mask.astype(bool)
+            idx = idx[keep]
+            weights = weights[keep] if weights is not None else None
+        return np.bincount(idx, weights=weights, minlength=size)[:size].astype(np.int64)
+
+    counts = array("q", [0]) * size
+    for row, i in enumerate(idx):
+        if mask is not None and not mask[row]:
+            continue
+        counts[i] += weights[row] if weights is not None else 1
+    return counts
+
+
+def _positive(col):
+    """
+    Nur die Einträge > 0 (z.B. E-Mails, die überhaupt dabei waren).
+    """
+    if np is not None:
+        return col[col > 0]
+    return array(col.typecode, (v for v in col if v > 0))
+
+
+def _unique_pairs(a, b, b_size: int):
+    """
+    Eindeutige (a, b)-Paare, z.B. (E-Mail, Event) ohne Mehrfachbuchungen.
+    """
+    if np is not None:
+        keys = np.unique(_pair_index(a, b, b_size))
+        return keys // b_size, keys % b_size
+
+    keys = sorted(set(_pair_index(a, b, b_size)))
+    return array("q", (k // b_size for k in keys)), array("q", (k % b_size for k in keys))
+
+
+def _take(values, idx):
+    """
+    values[idx] elementweise (z.B. Kohorte pro Zeile über den E-Mail-Code).
+    """
+    if np is not None:
+        return values[idx]
+    return array(values.typecode, (values[i] for i in idx))
+
+
+def _pair_index(a, b, b_size: int):
+    """
+    Flacher Index a * b_size + b (Zelle einer a x b Matrix).
+    """
+    if np is not None:
+        return a.astype(np.int64) * b_size + b
+    return array("q", (x * b_size + y for x, y in zip(a, b)))
+
+
+def _invert(mask):
+    if np is not None:
+        return 1 - mask
+    return array("b", (1 - v for v in mask))
+
+
+def _min_per_group(groups, values, size: int):
+    """
+    Kleinster Wert pro Gruppe (z.B. erstes besuchtes Event pro E-Mail); -1 = keiner.
+    """
+    if np is not None:
+        out = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        if len(groups):
+            np.minimum.at(out, groups, values)
+        out[out == np.iinfo(np.int64).max] = -1
+        return out
+
+    out = array("q", [-1] * size)
+    for g, v in zip(groups, values):
+        if out[g] == -1 or v < out[g]:
+            out[g] = v
+    return out
+
+
+def _cents(amount: Decimal | None) -> int:
+    return int((amount or Decimal("0.00")) * 100)
+
+
+def _euro(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(Decimal("0.01"))
+
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total, 4) if total else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Frame
+# ---------------------------------------------------------------------------
+
+@dataclass
+class EventColumn:
+    id: int
+    name: str
+    date: object
+
+
+class AnalyticsFrame:
+    """
+    Spalten (gleiche Länge pro Tabelle):
+    - p_event, p_email, p_cents, p_has_ticket: ein Eintrag pro Participant
+    - t_event, t_email, t_linked: ein Eintrag pro Ticket
+    Event-Indizes sind chronologisch (Event.Meta.ordering), E-Mails normalisiert.
+    """
+
+    def __init__(self, *, events: list[EventColumn], emails: list[str], p_event, p_email, p_cents, p_has_ticket,
+                 t_event, t_email, t_linked):
+        self.events = events
+        self.emails = emails
+        self.p_event = p_event
+        self.p_email = p_email
+        self.p_cents = p_cents
+        self.p_has_ticket = p_has_ticket
+        self.t_event = t_event
+        self.t_email = t_email
+        self.t_linked = t_linked
+
+    @classmethod
+    def load(cls) -> "AnalyticsFrame":
+        events = [EventColumn(*row) for row in Event.objects.values_list("id", "name", "date")]
+        event_index = {e.id: i for i, e in enumerate(events)}
+
+        email_index: dict[str, int] = {}
+
+        def email_code(email: str) -> int:
+            key = (email or "").strip().lower()
+            code = email_index.get(key)
+            if code is None:
+                code = email_index[key] = len(email_index)
+            return code
+
+        p_event, p_email, p_cents, p_has_ticket = array("q"), array("q"), array("q"), array("b")
+        rows = Participant.objects.values_list("event_id", "email", "amount", "ticket_id")
+        for event_id, email, amount, ticket_id in rows.iterator(chunk_size=CHUNK_SIZE):
+            p_event.append(event_index[event_id])
+            p_email.append(email_code(email))
+            p_cents.append(_cents(amount))
+            p_has_ticket.append(1 if ticket_id else 0)
+
+        t_event, t_email, t_linked = array("q"), array("q"), array("b")
+        rows = Ticket.objects.values_list("event_id", "email", "participant__id")
+        for event_id, email, participant_id in rows.iterator(chunk_size=CHUNK_SIZE):
+            t_event.append(event_index[event_id])
+            t_email.append(email_code(email))
+            t_linked.append(1 if participant_id else 0)
+
+        return cls(
+            events=events,
+            emails=list(email_index),
+            p_event=_column(p_event),
+            p_email=_column(p_email),
+            p_cents=_column(p_cents),
+            p_has_ticket=_column(p_has_ticket),
+            t_event=_column(t_event),
+            t_email=_column(t_email),
+            t_linked=_column(t_linked),
+        )
+
+    @property
+    def n_events(self) -> int:
+        return len(self.events)
+
+    @property
+    def n_emails(self) -> int:
+        return len(self.emails)
+
+    # --- Reports ---
+
+    def repeat_attendees(self) -> dict:
+        """
+        Wie viele E-Mails waren bei wie vielen verschiedenen Events dabei?
+        """
+        emails, _ = _unique_pairs(self.p_email, self.p_event, self.n_events)
+        events_per_email = _positive(_counts(emails, self.n_emails))
+        histogram = _counts(events_per_email, self.n_events + 1).tolist()
+        attendees = len(events_per_email)
+        repeat = attendees - histogram[1] if attendees else 0
+        return {
+            "attendees": attendees,
+            "repeat": repeat,
+            "repeat_rate": _rate(repeat, attendees),
+            "histogram": [{"events": n, "attendees": histogram[n]} for n in range(1, self.n_events + 1)],
+        }
+
+    def cohort_retention(self) -> list[dict]:
+        """
+        Kohorte = erstes besuchtes Event einer E-Mail; pro späterem Event der Anteil
+        der Kohorte, der (wieder) dabei war.
+        """
+        n = self.n_events
+        emails, events = _unique_pairs(self.p_email, self.p_event, n)
+        first = _min_per_group(emails, events, self.n_emails)
+        cells = _counts(_pair_index(_take(first, emails), events, n), n * n).tolist()
+
+        cohorts = []
+        for c in range(n):
+            size = cells[c * n + c]
+            if not size:
+                continue
+            cohorts.append({
+                "event": self.events[c],
+                "size": size,
+                # ein Eintrag pro Event der Saison; vor der Kohorte None
+                "retention": [
+                    {"event": self.events[e], "count": cells[c * n + e], "rate": _rate(cells[c * n + e], size)}
+                    if e >= c else None
+                    for e in range(n)
+                ],
+            })
+        return cohorts
+
+    def revenue_split(self) -> dict:
+        """
+        Umsatz und Teilnehmer mit Ticket vs. ohne Ticket, gesamt und pro Event.
+        """
+        n = self.n_events
+        without_ticket = _invert(self.p_has_ticket)
+        with_cents = _counts(self.p_event, n, weights=self.p_cents, mask=self.p_has_ticket).tolist()
+        without_cents = _counts(self.p_event, n, weights=self.p_cents, mask=without_ticket).tolist()
+        with_count = _counts(self.p_event, n, mask=self.p_has_ticket).tolist()
+        without_count = _counts(self.p_event, n, mask=without_ticket).tolist()
+
+        total_with, total_without = sum(with_cents), sum(without_cents)
+        return {
+            "ticket_revenue": _euro(total_with),
+            "no_ticket_revenue": _euro(total_without),
+            "ticket_share": _rate(total_with, total_with + total_without),
+            "ticket_participants": sum(with_count),
+            "no_ticket_participants": sum(without_count),
+            "events": [
+                {
+                    "event": self.events[i],
+                    "ticket_revenue": _euro(with_cents[i]),
+                    "no_ticket_revenue": _euro(without_cents[i]),
+                    "ticket_participants": with_count[i],
+                    "no_ticket_participants": without_count[i],
+                }
+                for i in range(n)
+            ],
+        }
+
+    def ticket_conversion(self) -> dict:
+        """
+        Anteil der Tickets pro Event, zu denen eine Zahlung (Participant) existiert.
+        """
+        n = self.n_events
+        tickets = _counts(self.t_event, n).tolist()
+        paid = _counts(self.t_event, n, mask=self.t_linked).tolist()
+        return {
+            "tickets": sum(tickets),
+            "paid": sum(paid),
+            "rate": _rate(sum(paid), sum(tickets)),
+            "events": [
+                {"event": self.events[i], "tickets": tickets[i], "paid": paid[i], "rate": _rate(paid[i], tickets[i])}
+                for i in range(n)
+            ],
+        }
+
+    def season_report(self) -> dict:
+        revenue_split = self.revenue_split()
+        conversion = self.ticket_conversion()
+        return {
+            "events": self.events,
+            "repeat": self.repeat_attendees(),
+            "cohorts": self.cohort_retention(),
+            "revenue_split": revenue_split,
+            "conversion": conversion,
+            # Konversion und Umsatz-Split pro Event in einer Zeile (für die Tabelle)
+            "per_event": [
+                {**conv, **split}
+                for conv, split in zip(conversion["events"], revenue_split["events"])
+            ],
+        }
+
+
+_memo = cache.LocalMemo("analytics", cache.DATA, stale_for=FRAME_MAX_AGE)
+
+
+def get_frame() -> AnalyticsFrame:
+    """
+    Prozess-lokaler Frame; nach Änderungen höchstens FRAME_MAX_AGE Sekunden alt.
+    """
+    return _memo.get_or_set("frame", AnalyticsFrame.load)
@@ -0,0 +1,76 @@
+"""
+Drill-down der Dashboard-Abweichungen pro Event.
+
+- orphans: Participants ohne Ticket (Zahler ohne Ticket-Match)
+- unpaid: Tickets ohne Participant (Anti-Join über NOT EXISTS)
+
+Beide Abfragen sind auf Indizes ausgelegt (participant_orphan_event_idx bzw.
+ticket_event_name_idx + Unique-Index auf Participant.ticket, siehe INDEXES);
+`python manage.py explain_anomalies` prüft das per EXPLAIN.
+"""
+from __future__ import annotations
+
+import re
+
+from django.db import connection
+from django.db.models import Exists, OuterRef, QuerySet
+
+from gfm.models import Participant, Ticket, email_iexact
+
+
+def orphans(event_id: int) -> QuerySet:
+    """
+    Participants ohne Ticket; `has_free_ticket` = ein passendes, noch freies Ticket existiert.
+    """
+    free_ticket = Ticket.objects.filter(
+        email_iexact(OuterRef("email")),
+        event_id=OuterRef("event_id"),
+        participant__isnull=True,
+    )
+    return (
+        Participant.objects
+        .filter(event_id=event_id, ticket__isnull=True)
+        .annotate(has_free_ticket=Exists(free_ticket))
+        .order_by("name", "id")
+    )
+
+
+def unpaid(event_id: int) -> QuerySet:
+    """
+    Tickets ohne Participant (Anti-Join).
+    """
+    return (
+        Ticket.objects
+        .filter(event_id=event_id)
+        .filter(~Exists(Participant.objects.filter(ticket_id=OuterRef("pk"))))
+        .order_by("name", "ticket_uuid")
+    )
+
+
+QUERIES = {
+    "orphans": orphans,
+    "unpaid": unpaid,
+}
+
+# Index, den der Plan der jeweiligen Abfrage enthalten muss
+INDEXES = {
+    "orphans": "participant_orphan_event_idx",
+    "unpaid": "ticket_event_name_idx",
+}
+
+# Volltabellen-Scan ohne Index (SQLite: "SCAN <tabelle>", PostgreSQL: "Seq Scan on <tabelle>")
+_FULL_SCAN = {
+    "sqlite": re.compile(r"\bSCAN (\w+)(?! USING)(?!.*INDEX)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+
+def full_scans(queryset: QuerySet) -> tuple[str, list[str]]:
+    """
+    (EXPLAIN-Ausgabe, Tabellen, die ohne Index gelesen werden).
+    """
+    plan = queryset.explain()
+    pattern = _FULL_SCAN.get(connection.vendor)
+    if pattern is None:
+        return plan, []
+    return plan, sorted({m.group(1) for m in pattern.finditer(plan)})
@@ -0,0 +1,114 @@
+"""
+Attendance-Index: pro E-Mail ein Bitset über Event-IDs (einmal / zweimal dabei).
+
+Die Bitsets liegen in EmailEntitlement und werden pro Prozess im Speicher gespiegelt.
+"Bei allen Events dabei" ist dann ein einziger AND-Vergleich gegen die Saison-Maske.
+Die Bitsets sind Python-ints (AND/bit_count wortweise) und brauchen kein NumPy, anders
+als gfm.analytics, das NumPy nutzt, wenn es installiert ist.
+
+Aktuell gehalten über den eigenen Namespace ATTENDANCE (nur Participant-Schreibzugriffe
+und der Neuaufbau zählen ihn hoch): ändert er sich, lädt der Index nur die seitdem
+geänderten Zeilen nach (EmailEntitlement.seq, in Commit-Reihenfolge vergeben). Komplett
+neu geladen wird nur, wenn sich die Events und damit die Saison-Maske ändern.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from gfm import cache
+from gfm.models import EmailEntitlement, Event, bits_from_bytes, event_bits
+
+
+@dataclass(frozen=True)
+class AttendanceStatus:
+    attended_all: bool
+    attended_all_twice: bool
+    missing: int  # Anzahl Events der Saison ohne Teilnahme
+
+
+def status_for_bits(season_mask: int, once: int, twice: int) -> AttendanceStatus:
+    missing = season_mask & ~once
+    return AttendanceStatus(
+        attended_all=bool(season_mask) and not missing,
+        attended_all_twice=bool(season_mask) and not (season_mask & ~twice),
+        missing=missing.bit_count(),
+    )
+
+
+class AttendanceIndex:
+    def __init__(self, *, season_mask: int, once: dict[str, int], twice: dict[str, int], version: int = 0):
+        self.season_mask = season_mask
+        self.once = once
+        self.twice = twice
+        self.version = version  # Stand von ATTENDANCE beim letzten Nachladen
+        self.watermark = None  # höchste EmailEntitlement.seq im Index
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "AttendanceIndex":
+        # Version vor den Zeilen lesen: spätere Änderungen lösen ein weiteres Nachladen aus
+        index = cls(
+            season_mask=event_bits(Event.objects.values_list("id", flat=True)),
+            once={},
+            twice={},
+            version=cache.namespace_version(cache.ATTENDANCE),
+        )
+        index._apply(EmailEntitlement.objects.all())
+        return index
+
+    def _apply(self, queryset) -> None:
+        rows = queryset.values_list("email", "attended_bits", "attended_twice_bits", "seq")
+        for email, raw_once, raw_twice, seq in rows.iterator(chunk_size=2000):
+            self.once[email] = bits_from_bytes(raw_once)
+            twice = bits_from_bytes(raw_twice)
+            if twice:
+                self.twice[email] = twice
+            else:
+                self.twice.pop(email, None)
+            if self.watermark is None or seq > self.watermark:
+                self.watermark = seq
+
+    def refresh(self, version: int) -> None:
+        """
+        Nur die seit dem letzten Stand geänderten Zeilen nachladen (eine Abfrage).
+        """
+        with self._lock:
+            if version == self.version:
+                return
+            changed = EmailEntitlement.objects.all()
+            if self.watermark is not None:
+                changed = changed.filter(seq__gt=self.watermark)
+            self._apply(changed)
+            self.version = version
+
+    def bits(self, email: str) -> tuple[int, int]:
+        key = (email or "").strip().lower()
+        return self.once.get(key, 0), self.twice.get(key, 0)
+
+    def status(self, email: str) -> AttendanceStatus:
+        return status_for_bits(self.season_mask, *self.bits(email))
+
+    def season_totals(self) -> tuple[int, int]:
+        """
+        (E-Mails bei allen Events, E-Mails bei allen Events doppelt) in einem Durchlauf.
+        """
+        mask = self.season_mask
+        if not mask:
+            return 0, 0
+        with self._lock:
+            all_once = sum(1 for bits in self.once.values() if bits & mask == mask)
+            all_twice = sum(1 for bits in self.twice.values() if bits & mask == mask)
+        return all_once, all_twice
+
+
+_memo = cache.LocalMemo("attendance", cache.EVENTS)
+
+
+def get_index() -> AttendanceIndex:
+    """
+    Prozess-lokale Kopie; neue Events laden sie neu, Teilnahmen werden nachgezogen.
+    """
+    index = _memo.get_or_set("index", AttendanceIndex.load)
+    index.refresh(cache.namespace_version(cache.ATTENDANCE))
+    return index
@@ -0,0 +1,78 @@
+"""
+Auth-Backend mit gecachtem User und Rechten: `request.user` kostet einen Cache-Zugriff
+statt einer Abfrage pro Request.
+
+Invalidierung (gfm.signals): Änderungen an Gruppen und Berechtigungen zählen den
+Namespace USERS hoch; ein gespeicherter User verwirft nur seine eigenen Einträge
+(ein reines last_login-Update beim Login gar nichts).
+
+Der Passwort-Hash kommt nicht in den geteilten Cache: gecacht werden die übrigen
+Felder und der Session-Hash (steht ohnehin in jeder Session). Das Passwort bleibt
+am User ein verzögertes Feld und wird nur bei Bedarf nachgeladen.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.db import router
+
+from gfm import cache
+
+USER_TIMEOUT = 60 * 60
+
+
+def _cached_row(user) -> tuple[dict, str] | None:
+    if user is None:
+        return None
+    fields = {
+        f.attname: getattr(user, f.attname)
+        for f in user._meta.concrete_fields
+        if f.attname != "password"
+    }
+    return fields, user.get_session_auth_hash()
+
+
+def _user_from_row(row):
+    if row is None:
+        return None
+    fields, session_hash = row
+    model = get_user_model()
+    user = model.from_db(router.db_for_read(model), list(fields), list(fields.values()))
+    user._cached_session_auth_hash = session_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is None and password is not None:
+            # ModelBackend dahinter (nur für alte Sessions) würde nochmal hashen
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        # None (gelöscht/inaktiv) wird ebenfalls gecacht
+        row = cache.get_or_set(
+            cache.USERS,
+            (user_id,),
+            lambda: _cached_row(super(CachedModelBackend, self).get_user(user_id)),
+            timeout=USER_TIMEOUT,
+        )
+        return _user_from_row(row)
+
+    async def aget_user(self, user_id):
+        # request.auser() (async Views): derselbe Cache statt ModelBackend.aget_user
+        return await sync_to_async(self.get_user)(user_id)
+
+    def get_all_permissions(self, user_obj, obj=None):
+        # Rechte-Set pro User (Gruppen + direkte Rechte); Admin fragt has_perm sehr oft ab
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return super().get_all_permissions(user_obj, obj)
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = cache.get_or_set(
+                cache.USERS,
+                ("perms", user_obj.pk),
+                lambda: super(CachedModelBackend, self).get_all_permissions(user_obj),
+                timeout=USER_TIMEOUT,
+            )
+        return user_obj._perm_cache
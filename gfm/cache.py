@@ -0,0 +1,327 @@
+"""
+Cache-Schicht der App.
+
+- Namespaces: jeder Namespace hat einen Versionszähler in der Tabelle
+  CacheVersion (Invalidierungs-Bus für alle Worker-Prozesse). `bump` zählt ihn
+  nach dem Commit hoch; alle Einträge des Namespace sind damit ungültig.
+- Schreibzugriffe auf Modelle bumpen die Namespaces aus WRITE_NAMESPACES
+  (gfm.signals), Bulk-Pfade rufen `bump` direkt.
+- Pro Request liest die CacheVersionMiddleware die Zähler einmal (`sync`, unter
+  ASGI `async_sync`) und verwirft dabei nur die prozesslokalen Speicher
+  (LocalMemo) betroffener Namespaces.
+  Mit geteiltem Cache kommen die Zähler aus einer Kopie im Cache (VERSIONS_KEY),
+  ein Request kostet dann keine Abfrage. Die Kopie schreiben nur Leser, gestempelt
+  mit der Generation (GENERATION_KEY), die sie vor dem Lesen der DB gesehen haben;
+  ein bump setzt nach dem Commit nur eine neue Generation. Kopien aus einem Stand
+  vor dem Commit passen damit nie zur aktuellen Generation.
+- `get_or_set` legt Werte im geteilten Django-Cache ab (siehe settings.CACHES),
+  gestempelt mit den Zählern; Treffer/Fehlschläge pro Namespace zählt `stats`.
+
+Der globale Daten-Stand (`data_version`) ist der Namespace DATA: jeder
+Schreibzugriff auf Ticket/Participant/Event zählt ihn hoch; Schlüssel, die ihn
+enthalten (`versioned_key`), laufen damit automatisch ins Leere.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+DATA = "data"
+EVENTS = "events"
+DASHBOARD = "dashboard"
+PARTICIPATION = "participation"
+USERS = "users"
+# Attendance-Index (gfm.attendance): nur Teilnahmen ändern die Bitsets
+ATTENDANCE = "attendance"
+
+# Modell -> Namespaces, die ein Schreibzugriff ungültig macht
+WRITE_NAMESPACES = {
+    "gfm.Ticket": (DATA,),
+    "gfm.Participant": (DATA, ATTENDANCE),
+    # Events stecken in jeder Teilnahme-Übersicht
+    "gfm.Event": (DATA, EVENTS, PARTICIPATION),
+    # Gruppen/Rechte: zusätzlich m2m_changed, siehe gfm.signals
+    # User selbst: nur dessen Einträge, siehe gfm.signals.forget_cached_user
+    "auth.Group": (USERS,),
+}
+
+# Kopie der Zähler im geteilten Cache: (Generation, Zähler). Gültig ist sie nur,
+# solange GENERATION_KEY noch dieselbe Generation enthält (siehe _load_shared).
+VERSIONS_KEY = "gfm:versions"
+VERSIONS_TIMEOUT = 300
+GENERATION_KEY = "gfm:versions:generation"
+
+
+def make_key(namespace: str, *parts) -> str:
+    return ":".join(["gfm", namespace, *map(str, parts)])
+
+
+# ---------------------------------------------------------------------------
+# Versionszähler (Bus)
+# ---------------------------------------------------------------------------
+
+# Stand der Zähler für den laufenden Request; None = außerhalb eines Requests
+# (jede Abfrage liest frisch), _STALE = nach einem eigenen bump neu lesen.
+_STALE = object()
+_snapshot: ContextVar = ContextVar("gfm_cache_versions", default=None)
+
+
+def _load() -> dict[str, int]:
+    from gfm.models import CacheVersion
+
+    return CacheVersion.objects.current()
+
+
+def _shared_cache() -> bool:
+    # LocMemCache gehört nur diesem Prozess -> Zähler immer aus der DB
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def _new_generation() -> str:
+    return uuid.uuid4().hex
+
+
+def _load_shared() -> dict[str, int]:
+    if not _shared_cache():
+        return _load()
+    found = cache.get_many([GENERATION_KEY, VERSIONS_KEY])
+    generation = found.get(GENERATION_KEY)
+    if generation is None:
+        # erster Leser (oder verdrängt): add, damit ein gleichzeitiger bump gewinnt
+        cache.add(GENERATION_KEY, _new_generation(), None)
+        generation = cache.get(GENERATION_KEY)
+    entry = found.get(VERSIONS_KEY)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+    # Generation ist vor der DB gelesen: ein bump danach ersetzt sie, diese Kopie verfällt
+    current = _load()
+    if generation is not None:
+        cache.set(VERSIONS_KEY, (generation, current), VERSIONS_TIMEOUT)
+    return current
+
+
+def versions() -> dict[str, int]:
+    snapshot = _snapshot.get()
+    if snapshot is None:
+        return _load()
+    if snapshot is _STALE:
+        snapshot = _load()
+        _snapshot.set(snapshot)
+    return snapshot
+
+
+def namespace_version(namespace: str) -> int:
+    return versions().get(namespace, 0)
+
+
+def bump(*namespaces: str) -> None:
+    """
+    Zähler erst nach dem Commit erhöhen: wer davor liest, stempelt seine
+    Einträge mit dem alten Stand, die damit direkt wieder ungültig sind.
+    """
+    if not namespaces:
+        return
+
+    def apply():
+        from gfm.models import CacheVersion
+
+        CacheVersion.objects.bump(namespaces)
+        if _shared_cache():
+            # nie einen vorher gelesenen Stand schreiben, nur die Kopie entwerten
+            cache.set(GENERATION_KEY, _new_generation(), None)
+        if _snapshot.get() is not None:
+            _snapshot.set(_STALE)
+
+    transaction.on_commit(apply)
+
+
+def bump_for_model(model) -> None:
+    bump(*WRITE_NAMESPACES.get(model._meta.label, ()))
+
+
+def data_version() -> int:
+    return namespace_version(DATA)
+
+
+def bump_data_version() -> None:
+    bump(DATA)
+
+
+def versioned_key(*parts) -> str:
+    return ":".join(["gfm", *map(str, parts), str(data_version())])
+
+
+# ---------------------------------------------------------------------------
+# Prozesslokale Speicher
+# ---------------------------------------------------------------------------
+
+_memos: list["LocalMemo"] = []
+_seen_lock = threading.Lock()
+_seen: dict[str, int] = {}
+
+
+class LocalMemo:
+    """
+    Speicher im Worker-Prozess (ohne Serialisierung), gültig solange sich die
+    Zähler von `namespaces` nicht ändern. Gebaut wird unter einem Lock, damit
+    parallele Threads nicht doppelt laden.
+
+    Mit `stale_for` (Sekunden) bleiben die Werte nach einer Änderung noch so
+    lange seit dem Bauen gültig - für teure Auswertungen, die nicht jeden
+    einzelnen Schreibzugriff sofort zeigen müssen.
+    """
+
+    def __init__(self, name: str, *namespaces: str, stale_for: float | None = None):
+        self.name = name
+        self.namespaces = namespaces
+        self.stale_for = stale_for
+        self._lock = threading.Lock()
+        self._versions: tuple | None = None
+        self._built_at = 0.0
+        self._values: dict = {}
+        _memos.append(self)
+
+    def _expired(self) -> bool:
+        return self.stale_for is None or time.monotonic() - self._built_at >= self.stale_for
+
+    def get_or_set(self, key, build):
+        current_versions = versions()
+        current = tuple(current_versions.get(ns, 0) for ns in self.namespaces)
+        with self._lock:
+            if self._versions != current and (not self._values or self._expired()):
+                self._values.clear()
+                self._versions = current
+                self._built_at = time.monotonic()
+            if key in self._values:
+                _count(self.name, "hits")
+                return self._values[key]
+            _count(self.name, "misses")
+            value = self._values[key] = build()
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._versions = None
+
+
+def _refresh() -> dict[str, int]:
+    current = _load_shared()
+    with _seen_lock:
+        changed = {ns for ns in current.keys() | _seen.keys() if current.get(ns) != _seen.get(ns)}
+        _seen.clear()
+        _seen.update(current)
+    if changed:
+        for memo in _memos:
+            # Memos mit stale_for prüfen ihr Alter selbst in get_or_set
+            if memo.stale_for is None and changed.intersection(memo.namespaces):
+                memo.clear()
+    return current
+
+
+def sync():
+    """
+    Zähler für den Request lesen (Cache-Kopie oder eine Abfrage) und lokale
+    Speicher der geänderten Namespaces verwerfen. Liefert das Token für `reset`.
+    """
+    return _snapshot.set(_refresh())
+
+
+async def async_sync():
+    # Lesen im Thread (Cache/DB sind synchron), Stand aber im Kontext des Requests setzen
+    return _snapshot.set(await sync_to_async(_refresh)())
+
+
+def reset(token) -> None:
+    _snapshot.reset(token)
+
+
+class CacheVersionMiddleware:
+    """
+    Sync und async (ASGI): async Views laufen damit ohne Umweg über einen Thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = sync()
+        try:
+            return self.get_response(request)
+        finally:
+            reset(token)
+
+    async def __acall__(self, request):
+        token = await async_sync()
+        try:
+            return await self.get_response(request)
+        finally:
+            reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Einträge im geteilten Cache
+# ---------------------------------------------------------------------------
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+
+def _count(namespace: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[namespace][outcome] += 1
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """
+    Treffer/Fehlschläge pro Namespace bzw. LocalMemo seit Prozessstart (nur dieser Worker).
+    """
+    with _stats_lock:
+        return {namespace: dict(counts) for namespace, counts in _stats.items()}
+
+
+def get_or_set(namespace: str, parts: tuple, build, *, depends: tuple[str, ...] = (), timeout=DEFAULT_TIMEOUT):
+    """
+    Wert aus dem Cache oder `build()`.
+
+    Der Eintrag gilt nur, solange sich weder `namespace` noch einer der
+    Namespaces in `depends` geändert hat (z.B. depends=(DATA,) für alles,
+    was aus Ticket/Participant/Event gerechnet wird).
+    """
+    current_versions = versions()
+    stamp = tuple(current_versions.get(ns, 0) for ns in (namespace, *depends))
+    key = make_key(namespace, *parts)
+
+    entry = cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        _count(namespace, "hits")
+        return entry[1]
+
+    _count(namespace, "misses")
+    value = build()
+    cache.set(key, (stamp, value), timeout)
+    return value
+
+
+def delete(namespace: str, *keys: tuple) -> None:
+    """
+    Einzelne Einträge entfernen; `keys` sind die `parts` aus get_or_set.
+    """
+    if keys:
+        cache.delete_many([make_key(namespace, *parts) for parts in keys])
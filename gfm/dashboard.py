@@ -0,0 +1,160 @@
+"""
+Dashboard-Daten, aufgeteilt in Abschnitte (KPIs, Event-Tabelle, Charts).
+
+Alle Abschnitte lesen nur Rollup-Tabellen und werden pro Daten-Stand gecacht;
+die JSON-Endpoints verwenden den Stand zusätzlich als ETag.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils import timezone
+
+from gfm import cache
+from gfm.forms import DashboardFilterForm
+from gfm.models import CheckinBucket, DailyRevenue, Event, EventStats
+from gfm.pricing import season_discount
+
+CACHE_TIMEOUT = 60 * 60
+# größere Lücken zwischen Check-in-Buckets werden nicht mit Nullen aufgefüllt
+CHECKIN_FILL_MAX_GAP = timedelta(hours=2)
+
+
+def _cached(parts: tuple, build):
+    return cache.get_or_set(cache.DASHBOARD, parts, build, depends=(cache.DATA,), timeout=CACHE_TIMEOUT)
+
+
+def event_rows() -> list[dict]:
+    """
+    Eine Zeile pro Event aus dem Rollup (EventStats), neueste zuerst.
+    """
+    def build():
+        return [
+            {
+                "event_id": r.event_id,
+                "name": r.event.name,
+                "date": r.event.date.isoformat(),
+                "revenue": str(r.revenue),
+                "tickets": r.tickets,
+                "participants": r.participants,
+                "orphans": r.orphans,
+                "unpaid": r.unpaid,
+                "orphans_url": reverse("event_orphans", args=[r.event_id]),
+                "unpaid_url": reverse("event_unpaid", args=[r.event_id]),
+            }
+            for r in EventStats.objects.rows()
+        ]
+
+    return _cached(("rows",), build)
+
+
+def kpis() -> dict:
+    def build():
+        rows = event_rows()
+
+        # Globale KPIs = Summe über die Events
+        total_revenue = sum((Decimal(r["revenue"]) for r in rows), Decimal("0.00"))
+
+        # --- RABATT LOGIK ---
+        # Attendance-Index, Bewertung in gfm.pricing
+        eligible_count, discount_volume = season_discount()
+
+        return {
+            "revenue": str(total_revenue),
+            "adjusted_revenue": str(total_revenue - discount_volume),
+            "discount_volume": str(discount_volume),
+            "eligible_count": eligible_count,
+            "tickets": sum(r["tickets"] for r in rows),
+            "participants": sum(r["participants"] for r in rows),
+            "orphans": sum(r["orphans"] for r in rows),
+            "unpaid": sum(r["unpaid"] for r in rows),
+        }
+
+    return _cached(("kpis",), build)
+
+
+def event_chart() -> dict:
+    """
+    Umsatz / Tickets / Teilnehmer pro Event (chronologisch).
+    """
+    rows = list(reversed(event_rows()))
+    return {
+        "labels": [f"{date.fromisoformat(r['date']).strftime('%d.%m.%Y')} ({r['name'][:15]}...)" for r in rows],
+        "revenue": [float(r["revenue"]) for r in rows],
+        "tickets": [r["tickets"] for r in rows],
+        "participants": [r["participants"] for r in rows],
+    }
+
+
+def default_checkin_event():
+    today = timezone.localdate()
+    return (
+        Event.objects.filter(date=today).first()
+        or Event.objects.filter(date__lt=today).order_by("-date").first()
+    )
+
+
+def resolve_filters(params) -> tuple[DashboardFilterForm, dict]:
+    form = DashboardFilterForm(params or None)
+    filters = form.cleaned_data if form.is_valid() else {}
+    return form, {
+        "date_from": filters.get("date_from"),
+        "date_to": filters.get("date_to"),
+        "event": filters.get("event") or default_checkin_event(),
+    }
+
+
+def timeseries(*, date_from=None, date_to=None, event=None) -> dict:
+    def build():
+        # A) Kumulierter Umsatz nach Zahltag
+        cumulative = DailyRevenue.objects.cumulative(date_from, date_to)
+
+        # B) Check-ins pro 15 Minuten (Lücken mit 0 auffüllen)
+        buckets = []
+        if event is not None:
+            buckets = list(CheckinBucket.objects.filter(event=event).values_list("bucket_start", "checkins", "revenue"))
+
+        checkin_labels, checkin_counts, checkin_revenue = [], [], []
+        if buckets:
+            by_start = {timezone.localtime(start): (n, revenue) for start, n, revenue in buckets}
+            step = timedelta(minutes=CheckinBucket.BUCKET_MINUTES)
+            starts = sorted(by_start)
+            # über mehrere Tage hinweg braucht das Label das Datum, sonst wiederholt sich "%H:%M"
+            label_format = "%H:%M" if starts[0].date() == starts[-1].date() else "%d.%m. %H:%M"
+            for previous, start in zip([None, *starts], starts):
+                # nur kurze Lücken auffüllen; ein Nachzügler Tage später erzeugt keine Tausenden Nullpunkte
+                if previous is not None and start - previous <= CHECKIN_FILL_MAX_GAP:
+                    current = previous + step
+                    while current < start:
+                        checkin_labels.append(current.strftime(label_format))
+                        checkin_counts.append(0)
+                        checkin_revenue.append(0.0)
+                        current += step
+                n, revenue = by_start[start]
+                checkin_labels.append(start.strftime(label_format))
+                checkin_counts.append(n)
+                checkin_revenue.append(float(revenue))
+
+        return {
+            "checkin_event": (
+                {"id": event.pk, "name": event.name, "date": event.date.isoformat()} if event else None
+            ),
+            "revenue_labels": [day.strftime("%d.%m.%Y") for day, _ in cumulative],
+            "revenue_cumulative": [float(total) for _, total in cumulative],
+            "checkin_labels": checkin_labels,
+            "checkins": checkin_counts,
+            "checkin_revenue": checkin_revenue,
+        }
+
+    return _cached(("timeseries", date_from, date_to, event.pk if event else None), build)
+
+
+def section_etag(section: str, request) -> str:
+    """
+    ETag = Abschnitt + Daten-Stand + Query-String (Filter) + Tag (Default-Event).
+    """
+    raw = f"{section}:{cache.data_version()}:{timezone.localdate()}:{request.META.get('QUERY_STRING', '')}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
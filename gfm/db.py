@@ -0,0 +1,56 @@
+"""
+SQLite-Verbindungsprofil (settings.SQLITE_PRAGMAS).
+
+Die PRAGMAs gelten pro Verbindung (journal_mode=WAL bleibt zusätzlich in der
+Datei gespeichert) und werden deshalb bei jeder neuen Verbindung gesetzt,
+siehe gfm.signals.apply_sqlite_pragmas.
+
+Mit GFM_CACHE=sqlite liegt der Cache in einer eigenen SQLite-Datei (CacheRouter).
+"""
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+
+_NAME = re.compile(r"^[a-z_]+$")
+_VALUE = re.compile(r"^-?\w+$")
+
+
+def pragma_statements(pragmas: dict | None = None) -> list[str]:
+    if pragmas is None:
+        pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    statements = []
+    for name, value in pragmas.items():
+        value = str(value)
+        if not _NAME.match(name) or not _VALUE.match(value):
+            raise ValueError(f"Ungültiges SQLite-PRAGMA: {name}={value}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(cursor, pragmas: dict | None = None) -> None:
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
+
+
+class CacheRouter:
+    """
+    Djangos Datenbank-Cache (GFM_CACHE=sqlite) in der eigenen Datenbank "cache";
+    alle anderen Modelle bleiben in "default".
+    """
+
+    alias = "cache"
+    app_label = "django_cache"
+
+    def db_for_read(self, model, **hints):
+        return self.alias if model._meta.app_label == self.app_label else None
+
+    db_for_write = db_for_read
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == self.alias:
+            return app_label == self.app_label
+        if app_label == self.app_label:
+            return False
+        return None
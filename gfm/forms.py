@@ -1,14 +1,16 @@
-from decimal import Decimal
+import hashlib
+from dataclasses import dataclass
 
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import Row, Column, Button, Layout, Submit, HTML, Div, Field
+from crispy_forms.layout import Row, Column, Button, Layout, Submit
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
 from gfm.models import Event, Participant
+from gfm.pricing import PRICE_NO_TICKET
 
 
 class EmailAuthenticationForm(AuthenticationForm):
@@ -84,142 +86,130 @@ class TicketImportForm(forms.Form):
         return f
 
 
+@dataclass(frozen=True)
+class ParticipationGroupRow:
+    event: object  # Event
+    locked_tickets: list
+    field: object  # BoundField | None
+    cache_key: str | None
+
+
+@dataclass(frozen=True)
+class NoTicketBlock:
+    locked_events: list
+    field: object  # BoundField | None
+    cache_key: str | None
+
+
 class ParticipationSelectionForm(forms.Form):
+    """
+    Felder werden dynamisch aus der Teilnahme-Übersicht gebaut, das Markup kommt
+    aus dem Template (Fragment-Cache pro Event-Gruppe, siehe `cache_key`).
+    """
+
+    template_name = "tickets/partials/participation_form.html"
+    FRAGMENT_TIMEOUT = 60 * 60
+
     def __init__(self, *args, ticket_groups=None, no_ticket_events=None, cancel_url="#", **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout()
+        self.cancel_url = cancel_url
+        self._ticket_groups = ticket_groups or []
+        self._no_ticket_events = no_ticket_events or []
 
         # --- 1. Tickets ---
-        if ticket_groups:
-            self.helper.layout.append(HTML('<h6 class="fw-bold mb-3">Tickets</h6>'))
-
-            for group in ticket_groups:
-                # Container für das Event starten
-                self.helper.layout.append(
-                    HTML(f'<div class="card mb-3 border-0 shadow-sm"><div class="card-body py-3">'))
-                self.helper.layout.append(HTML(
-                    f'<div class="fw-bold mb-3 text-center">{group.event.name} <span class="fw-normal text-muted small">({group.event.date.strftime("%d.%m.%Y")})</span></div>'))
-
-                selectable_choices = []
-
-                for opt in group.tickets:
-                    # --- A) Button Text generieren ---
-                    # Standard: Nur der Name
-                    label_content = opt.ticket.name
-
-                    # Falls ein Kommentar existiert
-                    if opt.ticket.comment:
-                        label_content = format_html(
-                            "{}<br><small class='fw-normal' style='font-size: 0.85em; opacity: 0.8;'>{}</small>",
-                            opt.ticket.name,
-                            opt.ticket.comment
-                        )
-
-                    # --- B) Logik für "Bereits gebucht" vs. "Wählbar" ---
-                    if opt.checked:
-                        # === BEREITS GEBUCHT ===
-                        comment_html = f"<br><small>{opt.ticket.comment}</small>" if opt.ticket.comment else ""
-
-                        html_locked = f"""
-                                        <div class="form-check mb-2 touch-friendly-locked" data-event-id="{group.event.id}" data-locked="true">
-                                            <input class="form-check-input" type="checkbox" checked disabled>
-                                            <label class="form-check-label">
-                                                <strong>{opt.ticket.name}</strong>
-                                                <span class="badge bg-secondary">Bereits bezahlt</span>
-                                                {comment_html} 
-                                            </label>
-                                        </div>
-                                        """
-                        self.helper.layout.append(HTML(html_locked))
-                    else:
-                        # === NOCH FREI ===
-                        selectable_choices.append((opt.ticket.ticket_uuid, label_content))
-
-                if selectable_choices:
-                    field_name = f"group_{group.event.id}"
-                    self.fields[field_name] = forms.MultipleChoiceField(
-                        label="",
-                        choices=selectable_choices,
-                        required=False,
-                        widget=forms.CheckboxSelectMultiple
+        for group in self._ticket_groups:
+            selectable_choices = []
+            for opt in group.tickets:
+                if opt.checked:
+                    continue
+
+                label_content = opt.ticket.name
+                if opt.ticket.comment:
+                    label_content = format_html(
+                        "{}<br><small class='fw-normal' style='font-size: 0.85em; opacity: 0.8;'>{}</small>",
+                        opt.ticket.name,
+                        opt.ticket.comment
                     )
-                    self.helper.layout.append(Field(field_name, wrapper_class="mb-0 touch-friendly-select"))
+                selectable_choices.append((opt.ticket.ticket_uuid, label_content))
 
-                # Container schließen
-                self.helper.layout.append(HTML('</div></div>'))
+            if selectable_choices:
+                self.fields[f"group_{group.event.id}"] = self._checkbox_field(selectable_choices)
 
         # --- 2. Events ohne Ticket ---
-        if no_ticket_events:
-            self.helper.layout.append(HTML('<h6 class="fw-bold mt-4 mb-3">Anmeldungen ohne Ticket</h6>'))
-
-            self.helper.layout.append(HTML('<div class="card mb-3 border-0 shadow-sm"><div class="card-body">'))
-
-            nt_choices = []
-            has_locked_items = False
-
-            for item in no_ticket_events:
-                label = f"{item.event.name} ({item.event.date.strftime('%d.%m.%Y')})"
-
-                if item.checked:
-                    # === BEREITS GEBUCHT (Locked) ===
-                    has_locked_items = True
-                    html_locked = f"""
-                    <div class="form-check mb-2 touch-friendly-locked" data-event-id="{item.event.id}" data-locked="true">
-                        <input class="form-check-input" type="checkbox" checked disabled>
-                        <label class="form-check-label">
-                            {label} <span class="badge bg-secondary ms-1">Bereits dabei</span>
-                        </label>
-                    </div>
-                    """
-                    self.helper.layout.append(HTML(html_locked))
-                else:
-                    # === WÄHLBAR ===
-                    nt_choices.append((str(item.event.id), label))
-
-            if nt_choices:
-                self.fields['no_ticket_events_dynamic'] = forms.MultipleChoiceField(
-                    label="",
-                    choices=nt_choices,
-                    required=False,
-                    widget=forms.CheckboxSelectMultiple,
-                    help_text=""
-                )
-                self.helper.layout.append(Field('no_ticket_events_dynamic', wrapper_class="touch-friendly-select"))
-            elif not has_locked_items:
-                self.helper.layout.append(
-                    HTML('<div class="text-muted small text-center">Keine Events verfügbar.</div>'))
-
-            self.helper.layout.append(HTML('</div></div>'))
-
-        # --- 3. & 4. Sticky Footer ---
-        price_html = """
-            <div id="price-container" class="alert alert-info text-center fw-bold mb-2 shadow-sm" style="display: none;">
-                Gesamtpreis: <span id="total-price">0</span> €
-                <div id="discount-badge" class="badge bg-success ms-2" style="display:none;">Rabatt aktiv!</div>
-                <div id="price-details" class="small fw-normal mt-1 text-muted"></div>
-            </div>
-            """
-
-        self.helper.layout.append(
-            Div(
-                Div(
-                    HTML(price_html),
-                    Div(
-                        HTML(
-                            f'<a href="{cancel_url}" class="btn btn-outline-secondary id="btn-cancel" px-3 me-2" style="border-radius: 8px;">Abbrechen</a>'),
-                        Submit('submit', 'Auswahl speichern', css_class='btn-primary flex-grow-1 fw-bold py-2',
-                               style="border-radius: 8px;"),
-                        css_class="d-flex"
+        nt_choices = [
+            (str(item.event.id), self._event_label(item.event))
+            for item in self._no_ticket_events
+            if not item.checked
+        ]
+        if nt_choices:
+            self.fields["no_ticket_events_dynamic"] = self._checkbox_field(nt_choices)
+
+    @staticmethod
+    def _checkbox_field(choices):
+        return forms.MultipleChoiceField(
+            label="",
+            choices=choices,
+            required=False,
+            widget=forms.CheckboxSelectMultiple(attrs={"class": "form-check-input"}),
+        )
+
+    @staticmethod
+    def _event_label(event) -> str:
+        return f"{event.name} ({event.date.strftime('%d.%m.%Y')})"
+
+    def _fragment_key(self, field_name: str, *parts) -> str | None:
+        """
+        Inhaltsbasierter Schlüssel (Event, Ticket-Stand, gebucht-Status).
+        Gebundene Formulare (Fehlerfall) werden nicht gecacht.
+        """
+        if self.is_bound:
+            return None
+        raw = repr((field_name, field_name in self.fields, parts))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def ticket_group_rows(self) -> list[ParticipationGroupRow]:
+        rows = []
+        for group in self._ticket_groups:
+            field_name = f"group_{group.event.id}"
+            rows.append(
+                ParticipationGroupRow(
+                    event=group.event,
+                    locked_tickets=[opt.ticket for opt in group.tickets if opt.checked],
+                    field=self[field_name] if field_name in self.fields else None,
+                    cache_key=self._fragment_key(
+                        field_name,
+                        group.event.id, group.event.name, group.event.date,
+                        [(str(o.ticket.ticket_uuid), o.ticket.name, o.ticket.comment, o.ticket.updated_at, o.checked)
+                         for o in group.tickets],
                     ),
-                    css_class="container"
-                ),
-                css_class="sticky-bottom bg-white border-top py-3 mt-4 start-0 w-100 shadow-lg"
+                )
             )
+        return rows
+
+    def no_ticket_block(self) -> NoTicketBlock | None:
+        if not self._no_ticket_events:
+            return None
+        field_name = "no_ticket_events_dynamic"
+        return NoTicketBlock(
+            locked_events=[item.event for item in self._no_ticket_events if item.checked],
+            field=self[field_name] if field_name in self.fields else None,
+            cache_key=self._fragment_key(
+                field_name,
+                [(item.event.id, item.event.name, item.event.date, item.checked) for item in self._no_ticket_events],
+            ),
         )
 
+    def get_context(self):
+        context = super().get_context()
+        context.update({
+            "ticket_groups": self.ticket_group_rows(),
+            "no_ticket": self.no_ticket_block(),
+            "cancel_url": self.cancel_url,
+            "fragment_timeout": self.FRAGMENT_TIMEOUT,
+        })
+        return context
+
     def clean(self):
         cleaned_data = super().clean()
         all_tickets = []
@@ -281,7 +271,7 @@ class ParticipantNoTicketCreateForm(forms.ModelForm):
 
         help_texts = {
             "email": "Automatisch generierte Dummy-E-Mail (kann geändert werden).",
-            "amount": "Standard: 28,00 EUR (bei Bedarf anpassen).",
+            "amount": f"Standard: {str(PRICE_NO_TICKET).replace('.', ',')} EUR (bei Bedarf anpassen).",
         }
 
         widgets = {
@@ -294,7 +284,7 @@ class ParticipantNoTicketCreateForm(forms.ModelForm):
 
         self.fields["event"].queryset = Event.objects.all().order_by("-date", "name")
 
-        self.fields["amount"].initial = Decimal("28.00")
+        self.fields["amount"].initial = PRICE_NO_TICKET
 
         if not default_event_id:
             today_event = Event.objects.filter(date=timezone.localdate()).first()
@@ -345,4 +335,47 @@ class ParticipantNoTicketCreateForm(forms.ModelForm):
 
         if commit:
             obj.save()
-        return obj
\ No newline at end of file
+        return obj
+
+class DashboardFilterForm(forms.Form):
+    date_from = forms.DateField(
+        required=False,
+        label="Von",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    date_to = forms.DateField(
+        required=False,
+        label="Bis",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    event = forms.ModelChoiceField(
+        queryset=Event.objects.all().order_by("-date", "name"),
+        required=False,
+        label="Check-ins für",
+        empty_label="Event von heute",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.helper = FormHelper()
+        self.helper.form_method = "get"
+        self.helper.form_show_labels = True
+        self.helper.layout = Layout(
+            Row(
+                Column("date_from", css_class="col-6 col-md-3"),
+                Column("date_to", css_class="col-6 col-md-3"),
+                Column("event", css_class="col-12 col-md-4"),
+                Column(
+                    Submit("submit", "Filtern", css_class="btn btn-primary w-100"),
+                    css_class="col-12 col-md-2 d-flex align-items-end mb-3",
+                ),
+            ),
+        )
+
+    def clean(self):
+        cleaned = super().clean()
+        date_from, date_to = cleaned.get("date_from"), cleaned.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            self.add_error("date_to", "Bis-Datum liegt vor dem Von-Datum.")
+        return cleaned
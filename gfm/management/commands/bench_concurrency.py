@@ -0,0 +1,162 @@
+import http.client
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gfm.models import Event, Ticket, User
+
+# Lesepfade, die unter ASGI async laufen (plus eine synchrone Liste zum Vergleich)
+DEFAULT_PATHS = [
+    "/tickets/delta/?since={since}",
+    "/participants/delta/?since={since}",
+    "/dashboard/api/kpis/",
+    "/tickets/{ticket}/participation/",
+    "/tickets/{ticket}/participation/quote/",
+    "/tickets/",
+]
+
+
+def _login_cookie(email: str) -> str:
+    """
+    Session für `email` anlegen (wie ein Login), Cookie-Header für die Requests.
+    """
+    user = User.objects.filter(email__iexact=email).first()
+    if user is None:
+        raise CommandError(f"Kein User mit E-Mail {email}.")
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+
+
+def _slow_client(host: str, port: int, path: str, stop: threading.Event) -> None:
+    """
+    Langsamer Client: schickt die Header zeilenweise im Sekundentakt und hält die
+    Verbindung offen (wie ein schwaches Mobilnetz oder ein Long-Poll).
+    """
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}"] + [f"X-Slow-{i}: 1" for i in range(3600)]
+    try:
+        with socket.create_connection((host, port), timeout=5) as sock:
+            for line in lines:
+                if stop.wait(1):
+                    return
+                sock.sendall(f"{line}\r\n".encode())
+    except OSError:
+        return
+
+
+class Command(BaseCommand):
+    help = (
+        "Lastprobe gegen einen laufenden Server (Gunicorn sync oder Uvicorn, siehe README): "
+        "parallele Requests auf die Lesepfade, optional mit langsamen Clients, die Verbindungen belegen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Basis-URL des Servers")
+        parser.add_argument("--user", required=True, help="E-Mail des Users, als der die Requests laufen")
+        parser.add_argument("--path", action="append", dest="paths",
+                            help="Pfad (mehrfach); Standard: Delta-Endpoints, Dashboard-KPIs, Scan, Preis, Ticketliste")
+        parser.add_argument("--concurrency", type=int, default=20, help="Parallele Clients")
+        parser.add_argument("--duration", type=float, default=10.0, help="Sekunden pro Pfad")
+        parser.add_argument("--slow-clients", type=int, default=0,
+                            help="Zusätzliche langsame Verbindungen während der Messung")
+
+    def _paths(self, paths) -> list[tuple[str, str]]:
+        """
+        (Anzeige, Pfad): angezeigt wird die Vorlage ("/tickets/{ticket}/..."), nicht die UUID.
+        """
+        ticket = Ticket.objects.order_by("-event__date").values_list("ticket_uuid", flat=True).first()
+        if ticket is None and any("{ticket}" in p for p in paths):
+            raise CommandError("Keine Tickets vorhanden (Scan- und Preis-Endpoint brauchen eines).")
+        event = Event.objects.filter(date=timezone.localdate()).first()
+        since = quote(timezone.now().isoformat())
+        resolved = []
+        for template in paths:
+            path = template.format(since=since, ticket=ticket)
+            if event is None and "delta" in path:
+                # ohne Event von heute liefern die Listen nichts -> neuestes Event
+                latest = Event.objects.order_by("-date").values_list("id", flat=True).first()
+                path += f"&event={latest}"
+            resolved.append((template.split("?")[0], path))
+        return resolved
+
+    def _run(self, base, path: str, cookie: str, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+        conn_class = http.client.HTTPSConnection if base.scheme == "https" else http.client.HTTPConnection
+
+        def client():
+            latencies, errors, statuses = [], 0, set()
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    conn = conn_class(base.hostname, base.port, timeout=30)
+                    conn.request("GET", base.path.rstrip("/") + path, headers={"Cookie": cookie})
+                    response = conn.getresponse()
+                    response.read()
+                    conn.close()
+                except OSError:
+                    errors += 1
+                    continue
+                statuses.add(response.status)
+                if response.status >= 400:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+            return latencies, errors, statuses
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(lambda _: client(), range(concurrency)))
+
+        latencies = sorted(l for r in results for l in r[0])
+        errors = sum(r[1] for r in results)
+        statuses = set().union(*(r[2] for r in results))
+        return latencies, errors, statuses
+
+    def handle(self, *args, **options):
+        base = urlsplit(options["url"])
+        cookie = _login_cookie(options["user"])
+        paths = self._paths(options["paths"] or DEFAULT_PATHS)
+        concurrency, duration = options["concurrency"], options["duration"]
+
+        stop = threading.Event()
+        slow = [
+            threading.Thread(target=_slow_client, args=(base.hostname, base.port, "/", stop), daemon=True)
+            for _ in range(options["slow_clients"])
+        ]
+        for thread in slow:
+            thread.start()
+        if slow:
+            # Verbindungen aufbauen lassen, bevor gemessen wird
+            time.sleep(2)
+
+        self.stdout.write(
+            f"{options['url']}: {concurrency} Clients x {duration:.0f} s, {len(slow)} langsame Verbindungen"
+        )
+        self.stdout.write(f"{'Pfad':<48} {'Requests':>8} {'Fehler':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        try:
+            for label, path in paths:
+                latencies, errors, statuses = self._run(base, path, cookie, concurrency, duration)
+                if not latencies:
+                    self.stdout.write(self.style.ERROR(
+                        f"{label[:48]:<48} keine erfolgreichen Requests ({errors} Fehler, Status {sorted(statuses)})"
+                    ))
+                    continue
+                p50 = statistics.median(latencies) * 1000
+                p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+                self.stdout.write(
+                    f"{label[:48]:<48} {len(latencies):>8} {errors:>6} {len(latencies) / duration:>8.0f} "
+                    f"{p50:>8.1f} {p95:>8.1f}"
+                )
+        finally:
+            stop.set()
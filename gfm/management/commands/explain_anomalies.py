@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from gfm import anomalies
+from gfm.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Zeigt die EXPLAIN-Pläne der Drill-down-Abfragen (Zahler ohne Ticket, "
+        "Tickets ohne Zahlung) und schlägt fehl, wenn eine Tabelle ohne Index gelesen "
+        "wird oder der vorgesehene Index nicht im Plan steht."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, help="Event-ID (Standard: neuestes Event)")
+
+    def handle(self, *args, **options):
+        event_id = options["event"]
+        if event_id is None:
+            event_id = Event.objects.order_by("-date", "-id").values_list("id", flat=True).first() or 0
+
+        failed = []
+        for name, build in anomalies.QUERIES.items():
+            plan, scans = anomalies.full_scans(build(event_id))
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} (Event {event_id})"))
+            self.stdout.write(plan)
+            if scans:
+                failed.append(f"{name}: {', '.join(scans)}")
+            index = anomalies.INDEXES.get(name)
+            if index and index not in plan:
+                failed.append(f"{name}: {index} nicht verwendet")
+
+        if failed:
+            raise CommandError("Abfragen ohne vorgesehenen Index: " + "; ".join(failed))
+        self.stdout.write(self.style.SUCCESS("Alle Drill-down-Abfragen verwenden Indizes."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from gfm.cache import ATTENDANCE, DATA, bump
+from gfm.models import CheckinBucket, DailyRevenue, EmailEntitlement, EventStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Baut die vorberechneten Tabellen (EventStats, EmailEntitlement, "
+        "CheckinBucket, DailyRevenue) komplett neu auf."
+    )
+
+    def handle(self, *args, **options):
+        events = EventStats.objects.rebuild()
+        emails = EmailEntitlement.objects.rebuild()
+        buckets = CheckinBucket.objects.rebuild()
+        days = DailyRevenue.objects.rebuild()
+        # Dashboard und Attendance-Index in allen Workern neu laden
+        bump(DATA, ATTENDANCE)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rollups neu aufgebaut: {events} Events, {emails} E-Mails, "
+            f"{buckets} Check-in-Fenster, {days} Zahltage."
+        ))
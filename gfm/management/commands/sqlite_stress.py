@@ -0,0 +1,128 @@
+import copy
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+# eigener Alias für die temporäre Datei, konfiguriert wie DATABASES['default']
+ALIAS = "sqlite_stress"
+
+SCHEMA = (
+    "CREATE TABLE checkin (id INTEGER PRIMARY KEY, event_id INTEGER, email TEXT, amount NUMERIC)",
+    "CREATE TABLE stats (event_id INTEGER PRIMARY KEY, checkins INTEGER NOT NULL DEFAULT 0)",
+    "INSERT INTO stats (event_id, checkins) VALUES (1, 0)",
+)
+
+
+def _database(path: str, profile: bool) -> dict:
+    """
+    DATABASES['default'] auf die temporäre Datei umgebogen. Ohne Profil wie Django-Standard:
+    verzögertes BEGIN (kein transaction_mode), Python-Timeout 5 s.
+    """
+    database = copy.deepcopy(connections.settings[DEFAULT_DB_ALIAS])
+    database["NAME"] = path
+    if not profile:
+        database["OPTIONS"] = {k: v for k, v in database["OPTIONS"].items() if k != "transaction_mode"}
+    return database
+
+
+@contextmanager
+def _connection(database: dict, pragmas: dict):
+    """
+    Django-Verbindung auf `database`; connection_created (gfm.signals) setzt dabei `pragmas`.
+    """
+    connections.settings[ALIAS] = database
+    try:
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            yield connections[ALIAS]
+    finally:
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+
+def _worker(args):
+    """
+    Ein "Gunicorn-Worker": Check-ins wie im Betrieb (lesen, einfügen, Rollup hochzählen).
+    """
+    database, pragmas, writes = args
+    ok = locked = 0
+    with _connection(database, pragmas) as connection:
+        for i in range(writes):
+            try:
+                with transaction.atomic(using=ALIAS), connection.cursor() as cursor:
+                    cursor.execute("SELECT checkins FROM stats WHERE event_id = 1")
+                    cursor.fetchone()
+                    cursor.execute(
+                        "INSERT INTO checkin (event_id, email, amount) VALUES (1, %s, 23)",
+                        [f"w{os.getpid()}-{i}@example.com"],
+                    )
+                    cursor.execute("UPDATE stats SET checkins = checkins + 1 WHERE event_id = 1")
+                ok += 1
+            except OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+                locked += 1
+    return ok, locked
+
+
+class Command(BaseCommand):
+    help = (
+        "Parallele Schreiblast auf eine temporäre SQLite-Datei über Djangos Verbindungen: einmal mit "
+        "Django-Standard, einmal wie DATABASES['default'] (transaction_mode) mit settings.SQLITE_PRAGMAS. "
+        "Zeigt 'database is locked'-Fehler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=200, help="Transaktionen pro Worker")
+
+    def _run(self, *, profile: bool, workers: int, writes: int) -> tuple[int, int, float]:
+        pragmas = settings.SQLITE_PRAGMAS if profile else {}
+        with tempfile.TemporaryDirectory() as tmp:
+            database = _database(os.path.join(tmp, "stress.sqlite3"), profile)
+            with _connection(database, pragmas) as connection, connection.cursor() as cursor:
+                for statement in SCHEMA:
+                    cursor.execute(statement)
+
+            # keine offenen Verbindungen in die Worker-Prozesse vererben
+            connections.close_all()
+            started = time.perf_counter()
+            with Pool(workers, initializer=django.setup) as pool:
+                results = pool.map(_worker, [(database, pragmas, writes)] * workers)
+            elapsed = time.perf_counter() - started
+
+            with _connection(database, pragmas) as connection, connection.cursor() as cursor:
+                cursor.execute("SELECT checkins FROM stats WHERE event_id = 1")
+                (counted,) = cursor.fetchone()
+
+        ok = sum(r[0] for r in results)
+        locked = sum(r[1] for r in results)
+        if counted != ok:
+            raise CommandError(f"Rollup inkonsistent: {counted} gezählt, {ok} committed.")
+        return ok, locked, elapsed
+
+    def handle(self, *args, **options):
+        if connections[DEFAULT_DB_ALIAS].vendor != "sqlite":
+            raise CommandError("DATABASES['default'] ist keine SQLite-Datenbank.")
+        workers, writes = options["workers"], options["writes"]
+        self.stdout.write(f"{workers} Worker x {writes} Transaktionen")
+
+        results = {}
+        for label, profile in (("Django-Standard", False), ("SQLITE_PRAGMAS", True)):
+            ok, locked, elapsed = self._run(profile=profile, workers=workers, writes=writes)
+            results[profile] = locked
+            self.stdout.write(
+                f"{label:<16} {ok:>6} ok  {locked:>6} locked  {elapsed:6.2f} s  {ok / elapsed:8.0f} tx/s"
+            )
+
+        if results[True]:
+            raise CommandError(f"Auch mit Profil {results[True]} x 'database is locked'.")
+        self.stdout.write(self.style.SUCCESS("Mit Profil keine 'database is locked'-Fehler."))
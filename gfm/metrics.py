@@ -0,0 +1,336 @@
+"""
+Metriken im Prometheus-Textformat (View `metrics`, URL /metrics/).
+
+- Zähler und Histogramme liegen pro Worker-Prozess im Speicher (`inc`, `observe`).
+  Höchstens alle FLUSH_INTERVAL Sekunden (und beim Beenden) schreibt ein Worker
+  seinen Stand als `<pid>.json` nach settings.GFM_METRICS_DIR; der Abruf summiert
+  alle Dateien.
+- Dateien beendeter Worker wandern beim Abruf in `retired.json` (aufsummiert),
+  damit Zähler nach einem Worker-Neustart nicht zurückspringen.
+- Cache-Treffer (gfm.cache.stats) kommen beim Schreiben dazu; Live-Werte zum Event
+  von heute und die Trefferquoten werden erst beim Abruf berechnet.
+
+Ohne GFM_METRICS_DIR (Entwicklung) zählt nur der abgerufene Prozess.
+"""
+from __future__ import annotations
+
+import atexit
+import bisect
+import fcntl
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+FLUSH_INTERVAL = 5
+CHECKIN_WINDOW = timedelta(minutes=5)
+RETIRED = "retired"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+IMPORT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    kind: str  # "counter" | "histogram" | "gauge"
+    help: str
+    labels: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = ()
+
+
+METRICS = {m.name: m for m in [
+    Metric("gfm_http_request_duration_seconds", "histogram", "Request duration per view.",
+           ("view", "method"), REQUEST_BUCKETS),
+    Metric("gfm_http_responses_total", "counter", "Responses per view and status code.", ("view", "status")),
+    Metric("gfm_db_queries_total", "counter", "Database queries per view.", ("view",)),
+    Metric("gfm_db_query_duration_seconds_total", "counter", "Time spent in database queries per view.", ("view",)),
+    Metric("gfm_import_duration_seconds", "histogram", "Duration of a ticket CSV import.", ("result",), IMPORT_BUCKETS),
+    Metric("gfm_import_rows_total", "counter", "Imported ticket rows by outcome.", ("outcome",)),
+    Metric("gfm_cache_requests_total", "counter", "Cache lookups per namespace.", ("namespace", "result")),
+    Metric("gfm_cache_hit_ratio", "gauge", "Cache hits / lookups per namespace (all workers).", ("namespace",)),
+    Metric("gfm_event_tickets", "gauge", "Tickets for today's event.", ("event",)),
+    Metric("gfm_event_participants", "gauge", "Participants for today's event.", ("event",)),
+    Metric("gfm_event_unpaid_tickets", "gauge", "Tickets without participant for today's event.", ("event",)),
+    Metric("gfm_event_checkins_recent", "gauge", "Check-ins for today's event in the last 5 minutes.", ("event",)),
+]}
+
+_lock = threading.Lock()
+# (name, labels) -> Wert
+_counters: dict[tuple, float] = defaultdict(float)
+# (name, labels) -> [Anzahl pro Bucket ..., Anzahl > letzter Bucket, Summe]
+_histograms: dict[tuple, list] = {}
+_last_flush = 0.0
+_flushed = False
+
+
+def inc(name: str, *labels, value: float = 1) -> None:
+    with _lock:
+        _counters[(name, tuple(map(str, labels)))] += value
+
+
+def observe(name: str, *labels, value: float) -> None:
+    buckets = METRICS[name].buckets
+    key = (name, tuple(map(str, labels)))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(buckets, value)] += 1
+        entry[-1] += value
+
+
+def observe_request(view: str, method: str, status: int, total: float, queries: int, db: float) -> None:
+    """
+    Ein Request (aus gfm.perf.PerformanceMiddleware).
+    """
+    view = view or "<unresolved>"
+    with _lock:
+        _counters[("gfm_http_responses_total", (view, str(status)))] += 1
+        _counters[("gfm_db_queries_total", (view,))] += queries
+        _counters[("gfm_db_query_duration_seconds_total", (view,))] += db
+    observe("gfm_http_request_duration_seconds", view, method, value=total)
+    maybe_flush()
+
+
+def observe_import(result: str, duration: float, stats: dict | None = None) -> None:
+    observe("gfm_import_duration_seconds", result, value=duration)
+    for outcome, rows in (stats or {}).items():
+        inc("gfm_import_rows_total", outcome, value=rows)
+    maybe_flush()
+
+
+# ---------------------------------------------------------------------------
+# Stand pro Worker
+# ---------------------------------------------------------------------------
+
+def _snapshot() -> dict:
+    from gfm import cache
+
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(entry) for key, entry in _histograms.items()}
+    for namespace, counts in cache.stats().items():
+        counters[("gfm_cache_requests_total", (namespace, "hit"))] = counts["hits"]
+        counters[("gfm_cache_requests_total", (namespace, "miss"))] = counts["misses"]
+    return {
+        "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [[name, list(labels), entry] for (name, labels), entry in histograms.items()],
+    }
+
+
+def _path(directory: str, name) -> str:
+    return os.path.join(directory, f"{name}.json")
+
+
+def _write(path: str, data: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read(path: str) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(total: dict, data: dict) -> dict:
+    counters = {(n, tuple(l)): v for n, l, v in total.get("counters", [])}
+    histograms = {(n, tuple(l)): e for n, l, e in total.get("histograms", [])}
+    for name, labels, value in data.get("counters", []):
+        key = (name, tuple(labels))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, entry in data.get("histograms", []):
+        key = (name, tuple(labels))
+        current = histograms.get(key)
+        histograms[key] = entry if current is None else [a + b for a, b in zip(current, entry)]
+    return {
+        "counters": [[n, list(l), v] for (n, l), v in counters.items()],
+        "histograms": [[n, list(l), e] for (n, l), e in histograms.items()],
+    }
+
+
+class _DirectoryLock:
+    # Zusammenlegen nach retired.json nur von einem Prozess gleichzeitig
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, ".lock")
+
+    def __enter__(self):
+        self.file = open(self.path, "w")
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def _retire(directory: str, paths: list[str]) -> None:
+    with _DirectoryLock(directory):
+        retired_path = _path(directory, RETIRED)
+        retired = _read(retired_path) or {}
+        for path in paths:
+            data = _read(path)
+            if data is not None:
+                retired = _merge(retired, data)
+        _write(retired_path, retired)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def flush() -> None:
+    global _last_flush, _flushed
+    directory = settings.GFM_METRICS_DIR
+    if not directory:
+        return
+    path = _path(directory, os.getpid())
+    if not _flushed:
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            # Datei eines früheren Prozesses mit derselben PID
+            _retire(directory, [path])
+        # Rest seit dem letzten Schreiben beim geordneten Beenden des Workers
+        atexit.register(flush)
+        _flushed = True
+    _write(path, _snapshot())
+    _last_flush = time.monotonic()
+
+
+def maybe_flush() -> None:
+    if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect() -> dict:
+    """
+    Summe über alle Worker (bzw. nur dieser Prozess ohne GFM_METRICS_DIR).
+    """
+    directory = settings.GFM_METRICS_DIR
+    if not directory:
+        return _snapshot()
+    flush()
+
+    dead, total = [], {}
+    for entry in os.scandir(directory):
+        stem, ext = os.path.splitext(entry.name)
+        if ext != ".json" or stem == RETIRED:
+            continue
+        if stem.isdigit() and not _alive(int(stem)):
+            dead.append(entry.path)
+            continue
+        data = _read(entry.path)
+        if data is not None:
+            total = _merge(total, data)
+    if dead:
+        _retire(directory, dead)
+    return _merge(total, _read(_path(directory, RETIRED)) or {})
+
+
+# ---------------------------------------------------------------------------
+# Abruf
+# ---------------------------------------------------------------------------
+
+def live_gauges() -> list[tuple[str, tuple, float]]:
+    """
+    Event von heute: Tickets, Teilnehmer, offene Tickets (Rollup EventStats) und Check-ins
+    der letzten Minuten. Drei kleine Abfragen pro Abruf.
+    """
+    from gfm.models import Event, EventStats, Participant
+
+    event = Event.objects.filter(date=timezone.localdate()).order_by("id").first()
+    if event is None:
+        return []
+    stats = EventStats.objects.filter(event=event).first()
+    checkins = Participant.objects.filter(
+        event=event, created_at__gte=timezone.now() - CHECKIN_WINDOW
+    ).count()
+    labels = (event.name,)
+    return [
+        ("gfm_event_tickets", labels, stats.tickets if stats else 0),
+        ("gfm_event_participants", labels, stats.participants if stats else 0),
+        ("gfm_event_unpaid_tickets", labels, stats.unpaid if stats else 0),
+        ("gfm_event_checkins_recent", labels, checkins),
+    ]
+
+
+def _hit_ratios(counters: dict) -> list[tuple[str, tuple, float]]:
+    lookups: dict[str, list] = defaultdict(lambda: [0, 0])
+    for (name, labels), value in counters.items():
+        if name == "gfm_cache_requests_total":
+            namespace, result = labels
+            lookups[namespace][result == "hit"] += value
+    return [
+        ("gfm_cache_hit_ratio", (namespace,), hits / (hits + misses))
+        for namespace, (misses, hits) in sorted(lookups.items())
+        if hits + misses
+    ]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    data = collect()
+    counters = {(n, tuple(l)): v for n, l, v in data["counters"]}
+    histograms = {(n, tuple(l)): e for n, l, e in data["histograms"]}
+    gauges = {(n, labels): v for n, labels, v in _hit_ratios(counters) + live_gauges()}
+
+    samples: dict[str, list[str]] = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        metric = METRICS[name]
+        samples[name].append(f"{name}{_labels(metric.labels, labels)} {_number(value)}")
+    for (name, labels), value in sorted(gauges.items()):
+        metric = METRICS[name]
+        samples[name].append(f"{name}{_labels(metric.labels, labels)} {_number(value)}")
+    for (name, labels), entry in sorted(histograms.items()):
+        metric = METRICS[name]
+        cumulative = 0
+        for bound, count in zip((*metric.buckets, "+Inf"), entry[:-1]):
+            cumulative += count
+            le = f'le="{bound}"'
+            samples[name].append(f"{name}_bucket{_labels(metric.labels, labels, le)} {cumulative}")
+        samples[name].append(f"{name}_sum{_labels(metric.labels, labels)} {_number(entry[-1])}")
+        samples[name].append(f"{name}_count{_labels(metric.labels, labels)} {cumulative}")
+
+    lines = []
+    for name, metric in METRICS.items():
+        if name not in samples:
+            continue
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:57
+
+from django.db import migrations, models
+
+
+def backfill_entitlements(apps, schema_editor):
+    Participant = apps.get_model("gfm", "Participant")
+    EmailEntitlement = apps.get_model("gfm", "EmailEntitlement")
+
+    per_email = {}
+    for email, event_id in Participant.objects.values_list("email", "event_id").iterator():
+        counts = per_email.setdefault(email.strip().lower(), {})
+        counts[str(event_id)] = counts.get(str(event_id), 0) + 1
+
+    EmailEntitlement.objects.bulk_create(
+        [
+            EmailEntitlement(
+                email=email,
+                event_counts=counts,
+                events_attended=sum(1 for n in counts.values() if n >= 1),
+                events_attended_twice=sum(1 for n in counts.values() if n >= 2),
+            )
+            for email, counts in per_email.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0003_alter_participant_amount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailEntitlement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.CharField(max_length=254, unique=True)),
+                ('event_counts', models.JSONField(blank=True, default=dict)),
+                ('events_attended', models.PositiveIntegerField(default=0)),
+                ('events_attended_twice', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['events_attended'], name='gfm_emailen_events__9a2e84_idx'), models.Index(fields=['events_attended_twice'], name='gfm_emailen_events__27abd0_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_entitlements, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:58
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_event_stats(apps, schema_editor):
+    Event = apps.get_model("gfm", "Event")
+    EventStats = apps.get_model("gfm", "EventStats")
+    Participant = apps.get_model("gfm", "Participant")
+    Ticket = apps.get_model("gfm", "Ticket")
+
+    rows = {event_id: EventStats(event_id=event_id) for event_id in Event.objects.values_list("id", flat=True)}
+
+    for row in Participant.objects.values("event_id").annotate(
+        n=Count("pk"), total=Sum("amount"), no_ticket=Count("pk", filter=Q(ticket__isnull=True))
+    ):
+        stats = rows[row["event_id"]]
+        stats.participants = row["n"]
+        stats.revenue = row["total"] or Decimal("0.00")
+        stats.orphans = row["no_ticket"]
+
+    for row in Ticket.objects.values("event_id").annotate(
+        n=Count("pk"), open=Count("pk", filter=Q(participant__isnull=True))
+    ):
+        stats = rows[row["event_id"]]
+        stats.tickets = row["n"]
+        stats.unpaid = row["open"]
+
+    EventStats.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0004_emailentitlement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='gfm.event')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('tickets', models.IntegerField(default=0)),
+                ('participants', models.IntegerField(default=0)),
+                ('orphans', models.IntegerField(default=0)),
+                ('unpaid', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_event_stats, migrations.RunPython.noop),
+    ]
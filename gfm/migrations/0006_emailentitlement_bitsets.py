@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:00
+
+from django.db import migrations, models
+
+
+def _to_bytes(event_ids):
+    bits = 0
+    for event_id in event_ids:
+        bits |= 1 << int(event_id)
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def fill_bitsets(apps, schema_editor):
+    EmailEntitlement = apps.get_model("gfm", "EmailEntitlement")
+    objs = list(EmailEntitlement.objects.all())
+    for obj in objs:
+        counts = obj.event_counts or {}
+        obj.attended_bits = _to_bytes(e for e, n in counts.items() if n >= 1)
+        obj.attended_twice_bits = _to_bytes(e for e, n in counts.items() if n >= 2)
+    EmailEntitlement.objects.bulk_update(objs, ["attended_bits", "attended_twice_bits"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0005_eventstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailentitlement',
+            name='attended_bits',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.AddField(
+            model_name='emailentitlement',
+            name='attended_twice_bits',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.RunPython(fill_bitsets, migrations.RunPython.noop),
+    ]
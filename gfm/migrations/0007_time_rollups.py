@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:01
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+def backfill_time_rollups(apps, schema_editor):
+    Participant = apps.get_model("gfm", "Participant")
+    CheckinBucket = apps.get_model("gfm", "CheckinBucket")
+    DailyRevenue = apps.get_model("gfm", "DailyRevenue")
+
+    buckets = {}
+    for event_id, created_at, amount in Participant.objects.values_list("event_id", "created_at", "amount").iterator():
+        local = timezone.localtime(created_at)
+        start = local.replace(minute=local.minute - local.minute % 15, second=0, microsecond=0)
+        b = buckets.setdefault((event_id, start), [0, Decimal("0.00")])
+        b[0] += 1
+        b[1] += amount or Decimal("0.00")
+    CheckinBucket.objects.bulk_create(
+        [
+            CheckinBucket(event_id=event_id, bucket_start=start, checkins=n, revenue=revenue)
+            for (event_id, start), (n, revenue) in buckets.items()
+        ],
+        batch_size=500,
+    )
+
+    DailyRevenue.objects.bulk_create(
+        [
+            DailyRevenue(day=row["paid_at"], participants=row["n"], revenue=row["total"] or Decimal("0.00"))
+            for row in Participant.objects.filter(paid_at__isnull=False)
+            .values("paid_at")
+            .annotate(n=Count("pk"), total=Sum("amount"))
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0006_emailentitlement_bitsets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('participants', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CheckinBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('checkins', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkin_buckets', to='gfm.event')),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'bucket_start'), name='uniq_checkin_bucket_per_event')],
+            },
+        ),
+        migrations.RunPython(backfill_time_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0007_time_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(condition=models.Q(('ticket__isnull', True)), fields=['event', 'name'], name='participant_orphan_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'name'], name='ticket_event_name_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0008_anomaly_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='ticket_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='ticket_email_lower_idx'),
+        ),
+    ]
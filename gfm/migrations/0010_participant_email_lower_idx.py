@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:13
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0009_ticket_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='participant_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0011_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['event', 'updated_at'], name='participant_event_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'updated_at'], name='ticket_event_updated_idx'),
+        ),
+    ]
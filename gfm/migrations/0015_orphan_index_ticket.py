@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0014_requestprofile'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='participant',
+            name='participant_orphan_event_idx',
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(condition=models.Q(('ticket__isnull', True)), fields=['event', 'ticket', 'name'], name='participant_orphan_event_idx'),
+        ),
+    ]
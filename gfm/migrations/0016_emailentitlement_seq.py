@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gfm', '0015_orphan_index_ticket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailentitlement',
+            name='seq',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+    ]
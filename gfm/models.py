@@ -13,13 +13,27 @@ import io
 import uuid as uuid_lib
 
 from django.db import models, transaction
+from django.db import connection
 from django.db.models import ProtectedError
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.utils import timezone
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 
 
 
+def email_iexact(email, field: str = "email") -> Exact:
+    """
+    Case-insensitiver E-Mail-Vergleich als lower(field) = lower(email).
+    Anders als `__iexact` (PostgreSQL: UPPER(...)) nutzt das die lower(email)-Indizes.
+    `email` darf auch ein Ausdruck sein (z.B. OuterRef("email")).
+    """
+    if isinstance(email, str):
+        return Exact(Lower(field), email.lower())
+    return Exact(Lower(field), Lower(email))
+
+
 class Event(models.Model):
     name = models.CharField(max_length=255)
     date = models.DateField()
@@ -124,6 +138,8 @@ class TicketManager(models.Manager):
         cache[key] = event
         return event
 
+    IMPORT_BATCH_SIZE = 500
+
     def create_from_csv(self, csv_file):
         reader = self._parse_csv(csv_file)
 
@@ -133,6 +149,11 @@ class TicketManager(models.Manager):
         skipped = 0
         event_cache: dict[str, Event] = {}
 
+        # Endzustand pro Ticket-UUID (spätere Zeilen überschreiben frühere)
+        upserts: dict[uuid_lib.UUID, Ticket] = {}
+        cancels: dict[uuid_lib.UUID, int] = {}
+        rows = []
+
         with transaction.atomic():
             for line_no, row in enumerate(reader, start=2):
                 for f in self.REQUIRED_FIELDS:
@@ -157,19 +178,12 @@ class TicketManager(models.Manager):
                     raise ValueError(f"Unbekannter Status '{row['Status']}' in Zeile {line_no}")
                 status = self.STATUS_MAP[raw_status]
 
-                # Wenn abgesagt: Ticket (sofern vorhanden) löschen und nächste Zeile
+                rows.append((ticket_uuid, status))
+
+                # Wenn abgesagt: Ticket (sofern vorhanden) später löschen
                 if status == "CANCELED":
-                    try:
-                        deleted_count, _ = self.filter(ticket_uuid=ticket_uuid).delete()
-                    except ProtectedError:
-                        raise ValueError(
-                            f"Ticket {ticket_uuid} kann in Zeile {line_no} nicht gelöscht werden."
-                        )
-
-                    if deleted_count:
-                        deleted += 1
-                    else:
-                        skipped += 1
+                    upserts.pop(ticket_uuid, None)
+                    cancels[ticket_uuid] = line_no
                     continue
 
                 # Event über Name finden/erstellen (Datum initial: today)
@@ -179,24 +193,100 @@ class TicketManager(models.Manager):
                 # Optional: Kommentar
                 comment = str(row.get("Buchungskommentar") or "").strip()
 
-                # Ticket upsert über PK
-                obj, was_created = self.update_or_create(
+                cancels.pop(ticket_uuid, None)
+                upserts[ticket_uuid] = self.model(
                     ticket_uuid=ticket_uuid,
-                    defaults={
-                        "event": event,
-                        "name": str(row["Name"]).strip(),
-                        "email": email,
-                        "comment": comment,
-                    },
+                    event=event,
+                    name=str(row["Name"]).strip(),
+                    email=email,
+                    comment=comment,
                 )
 
-                if was_created:
-                    created += 1
-                else:
+            # Vorhandene Tickets (alter Stand für Zählung, Rollups und Cache-Invalidierung)
+            previous: dict[uuid_lib.UUID, tuple[str, int]] = {}
+            all_uuids = [u for u, _ in rows]
+            for i in range(0, len(all_uuids), self.IMPORT_BATCH_SIZE):
+                chunk = all_uuids[i:i + self.IMPORT_BATCH_SIZE]
+                for pk, email, event_id in self.filter(pk__in=chunk).values_list("pk", "email", "event_id"):
+                    previous[pk] = (email, event_id)
+
+            # Zählung wie bei zeilenweiser Verarbeitung
+            exists = set(previous)
+            for ticket_uuid, status in rows:
+                if status == "CANCELED":
+                    if ticket_uuid in exists:
+                        deleted += 1
+                        exists.discard(ticket_uuid)
+                    else:
+                        skipped += 1
+                elif ticket_uuid in exists:
                     updated += 1
+                else:
+                    created += 1
+                    exists.add(ticket_uuid)
+
+            to_delete = [u for u in cancels if u in previous]
+            for ticket_uuid in to_delete:
+                try:
+                    self.filter(ticket_uuid=ticket_uuid).delete()
+                except ProtectedError:
+                    raise ValueError(
+                        f"Ticket {ticket_uuid} kann in Zeile {cancels[ticket_uuid]} nicht gelöscht werden."
+                    )
+
+            self._upsert(list(upserts.values()))
+
+        touched_event_ids = {t.event_id for t in upserts.values()}
+        touched_event_ids |= {previous[u][1] for u in upserts if u in previous}
+        emails = {t.email for t in upserts.values()} | {previous[u][0] for u in upserts if u in previous}
+        self._after_bulk_upsert(event_ids=touched_event_ids, emails=emails)
 
         return {"created": created, "updated": updated, "skipped": skipped,"deleted": deleted}
 
+    def _upsert(self, tickets: list["Ticket"]) -> None:
+        """
+        Ticket-Upsert über PK: INSERT ... ON CONFLICT (ticket_uuid) DO UPDATE,
+        wo das Backend es kann (PostgreSQL, SQLite), sonst zeilenweise.
+        """
+        if not tickets:
+            return
+        if connection.features.supports_update_conflicts_with_target:
+            self.bulk_create(
+                tickets,
+                batch_size=self.IMPORT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["ticket_uuid"],
+                update_fields=["event", "name", "email", "comment", "updated_at"],
+            )
+            return
+        for t in tickets:
+            self.update_or_create(
+                ticket_uuid=t.ticket_uuid,
+                defaults={"event": t.event, "name": t.name, "email": t.email, "comment": t.comment},
+            )
+
+    def _after_bulk_upsert(self, *, event_ids: set[int], emails: set[str]) -> None:
+        """
+        bulk_create löst keine Signals aus: Autolink, Rollups und Caches hier nachziehen.
+        """
+        from gfm.cache import bump_data_version
+        from gfm.participation import invalidate_participation_summary
+
+        if not event_ids:
+            return
+
+        with transaction.atomic():
+            candidates = (
+                Participant.objects
+                .alias(email_lower=Lower("email"))
+                .filter(event_id__in=event_ids, ticket__isnull=True, email_lower__in={e.lower() for e in emails})
+            )
+            Participant.objects.autolink(candidates)
+            EventStats.objects.rebuild(event_ids=event_ids)
+
+        invalidate_participation_summary(*emails)
+        bump_data_version()
+
 
 class Ticket(models.Model):
     ticket_uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -220,8 +310,20 @@ class Ticket(models.Model):
         indexes = [
             models.Index(fields=["event"]),
             models.Index(fields=["email"]),
+            # Drill-down "Tickets ohne Zahlung" pro Event, sortiert nach Name
+            models.Index(fields=["event", "name"], name="ticket_event_name_idx"),
+            # Präfix-Suche (Admin-Autocomplete) als Bereichsabfrage auf lower(...)
+            models.Index(Lower("name"), name="ticket_name_lower_idx"),
+            models.Index(Lower("email"), name="ticket_email_lower_idx"),
+            # Live-Liste: Zeilen eines Events, die seit dem Wasserzeichen geändert wurden
+            models.Index(fields=["event", "updated_at"], name="ticket_event_updated_idx"),
         ]
 
+    def save(self, *args, **kwargs):
+        # pre_save (gfm.signals) liest den alten Stand damit unter derselben Schreibsperre
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
     @classmethod
     def registered_for_email(cls, email: str):
         """
@@ -229,7 +331,7 @@ class Ticket(models.Model):
         """
         return (
             cls.objects
-            .filter(email__iexact=email)
+            .filter(email_iexact(email))
             .select_related("event")
             .order_by("event__date", "event__name", "-created_at")
         )
@@ -240,6 +342,14 @@ class Ticket(models.Model):
         Liefert pro Event genau ein Ticket (das 'neueste' nach created_at),
         für diese Email (REGISTERED).
         """
+        if connection.features.can_distinct_on_fields:
+            # PostgreSQL: DISTINCT ON (Event) liefert direkt das neueste Ticket pro Event
+            return list(
+                cls.registered_for_email(email)
+                .order_by("event__date", "event__name", "event_id", "-created_at")
+                .distinct("event__date", "event__name", "event_id")
+            )
+
         tickets = list(cls.registered_for_email(email))
         seen = set()
         result = []
@@ -256,14 +366,14 @@ class Ticket(models.Model):
 
 class ParticipantManager(models.Manager):
     """
-    Stark vereinfacht: genau zwei Methoden.
+    Stark vereinfacht.
     """
 
     def tickets_for_email(self, email: str):
         # "organisiert alle tickets" = alle REGISTERED Tickets für Email, inkl. event
         return (
             Ticket.objects
-            .filter(email__iexact=email)
+            .filter(email_iexact(email))
             .select_related("event")
             .order_by("event__date", "event__name", "-created_at")
         )
@@ -272,6 +382,38 @@ class ParticipantManager(models.Manager):
         # "organisiert über events alle events" = alle Events, keine Zeitlimits
         return Event.objects.all().order_by("date", "name")
 
+    def autolink(self, queryset) -> dict[str, int]:
+        """
+        Autolinking für alle Participants im Queryset (Participant.save() macht den Match),
+        sinnvoll wenn z.B. Tickets nachträglich importiert wurden.
+        Gespeichert werden nur Zeilen, für die ein freies Ticket (event + email) existiert.
+        """
+        free_ticket = Ticket.objects.filter(
+            email_iexact(models.OuterRef("email")),
+            event_id=models.OuterRef("event_id"),
+            participant__isnull=True,
+        )
+        stats = {"linked": 0, "skipped": 0, "unmatched": 0}
+
+        with transaction.atomic():
+            # Sperren für konsistente Verknüpfung bei parallelen Operationen
+            qs = queryset.select_for_update().annotate(has_free_ticket=models.Exists(free_ticket))
+            for p in qs:
+                if p.ticket_id:
+                    stats["skipped"] += 1
+                    continue
+                if not p.has_free_ticket:
+                    stats["unmatched"] += 1
+                    continue
+
+                p.save()  # ruft _try_autolink_ticket() auf
+                if p.ticket_id:
+                    stats["linked"] += 1
+                else:
+                    stats["unmatched"] += 1
+
+        return stats
+
 class Participant(models.Model):
     """
     Participant kann ohne Ticket existieren.
@@ -314,6 +456,15 @@ class Participant(models.Model):
         indexes = [
             models.Index(fields=["event", "email"]),
             models.Index(fields=["paid_at"]),
+            models.Index(Lower("email"), name="participant_email_lower_idx"),
+            # Drill-down "Zahler ohne Ticket" pro Event (nur diese Zeilen im Index).
+            # ticket als Spalte: sonst nimmt SQLite für "ticket IS NULL" den Unique-Index
+            models.Index(
+                fields=["event", "ticket", "name"],
+                condition=models.Q(ticket__isnull=True),
+                name="participant_orphan_event_idx",
+            ),
+            models.Index(fields=["event", "updated_at"], name="participant_event_updated_idx"),
         ]
         constraints = [
             # max 1 no-ticket pro (event,email)
@@ -344,8 +495,9 @@ class Participant(models.Model):
             return
 
         qs = Ticket.objects.filter(
+            email_iexact(self.email),
             event_id=self.event_id,
-            email__iexact=self.email
+            participant__isnull=True,  # bereits verknüpfte Tickets nicht doppelt vergeben
         )
 
         ticket = qs.order_by("-created_at").first()
@@ -358,6 +510,481 @@ class Participant(models.Model):
             super().save(*args, **kwargs)
 
 
+def event_bits(event_ids) -> int:
+    """
+    Bitset über Event-IDs (Bit n gesetzt = Event n enthalten).
+    """
+    bits = 0
+    for event_id in event_ids:
+        bits |= 1 << int(event_id)
+    return bits
+
+
+def bits_to_bytes(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def bits_from_bytes(raw) -> int:
+    return int.from_bytes(bytes(raw or b""), "little")
+
+
+class EmailEntitlementManager(models.Manager):
+    # von EmailEntitlement.set_counts gesetzt
+    COUNT_FIELDS = ("event_counts", "events_attended", "events_attended_twice", "attended_bits", "attended_twice_bits")
+
+    def for_email(self, email: str) -> Optional["EmailEntitlement"]:
+        return self.filter(email=(email or "").strip().lower()).first()
+
+    def apply(self, email: str, event_id: int, delta: int) -> None:
+        """
+        Zählt eine Teilnahme (delta=+1) bzw. entfernt sie (delta=-1).
+        """
+        key = (email or "").strip().lower()
+        if not key or not event_id or not delta:
+            return
+
+        def add(counts: dict) -> dict:
+            counts = dict(counts or {})
+            n = counts.get(str(event_id), 0) + delta
+            if n > 0:
+                counts[str(event_id)] = n
+            else:
+                counts.pop(str(event_id), None)
+            return counts
+
+        with transaction.atomic(savepoint=False):
+            seq = self._next_seq()
+            # Neue E-Mail: gleich mit den Zählern anlegen (kein zweites UPDATE)
+            new = self.model(email=key, seq=seq)
+            new.set_counts(add({}))
+            obj, created = self.select_for_update().get_or_create(
+                email=key, defaults={f: getattr(new, f) for f in (*self.COUNT_FIELDS, "seq")},
+            )
+            if created:
+                return
+            obj.set_counts(add(obj.event_counts))
+            obj.seq = seq
+            obj.save(update_fields=[*self.COUNT_FIELDS, "seq", "updated_at"])
+
+    def _next_seq(self) -> int:
+        """
+        Nächste Sequenz für geänderte Zeilen (Zähler ATTENDANCE in CacheVersion).
+        Muss in der Schreib-Transaktion laufen: die Zählerzeile bleibt bis zum Commit
+        gesperrt, damit werden die Sequenzen in aufsteigender Reihenfolge sichtbar.
+        """
+        from gfm.cache import ATTENDANCE
+
+        return CacheVersion.objects.advance(ATTENDANCE)
+
+    def rebuild(self) -> int:
+        """
+        Komplett neu aus Participant aufbauen (z.B. nach Datenkorrekturen).
+        """
+        # Vorhandene E-Mails ohne Teilnahme bleiben als leere Zeile stehen (wie in `apply`),
+        # damit der Attendance-Index sie beim Nachladen über `seq` mitbekommt
+        per_email: dict[str, dict[str, int]] = {email: {} for email in self.values_list("email", flat=True)}
+        for email, event_id in Participant.objects.values_list("email", "event_id").iterator():
+            counts = per_email.setdefault(email.strip().lower(), {})
+            counts[str(event_id)] = counts.get(str(event_id), 0) + 1
+
+        objs = []
+        for email, counts in per_email.items():
+            obj = self.model(email=email)
+            obj.set_counts(counts)
+            objs.append(obj)
+
+        with transaction.atomic():
+            seq = self._next_seq()
+            for obj in objs:
+                obj.seq = seq
+            self.all().delete()
+            self.bulk_create(objs, batch_size=500)
+        return len(objs)
+
+
+
+class EmailEntitlement(models.Model):
+    """
+    Vorberechnete Teilnahmen pro E-Mail (Basis für Serien-Rabatte).
+    Wird über Participant-Signals inkrementell gepflegt.
+    """
+
+    email = models.CharField(max_length=254, unique=True)  # immer lower-case
+    event_counts = models.JSONField(default=dict, blank=True)  # {"<event_id>": anzahl}
+    events_attended = models.PositiveIntegerField(default=0)
+    events_attended_twice = models.PositiveIntegerField(default=0)
+
+    # Bitsets über Event-IDs (Bit n = Event mit id n), little-endian
+    attended_bits = models.BinaryField(default=b"", blank=True)
+    attended_twice_bits = models.BinaryField(default=b"", blank=True)
+
+    # aufsteigend pro Änderung (EmailEntitlementManager._next_seq), Basis für das Nachladen im Attendance-Index
+    seq = models.BigIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EmailEntitlementManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["events_attended"]),
+            models.Index(fields=["events_attended_twice"]),
+        ]
+
+    def set_counts(self, counts: dict) -> None:
+        self.event_counts = counts
+        self.events_attended = sum(1 for n in counts.values() if n >= 1)
+        self.events_attended_twice = sum(1 for n in counts.values() if n >= 2)
+        self.attended_bits = bits_to_bytes(event_bits(int(e) for e, n in counts.items() if n >= 1))
+        self.attended_twice_bits = bits_to_bytes(event_bits(int(e) for e, n in counts.items() if n >= 2))
+
+    @property
+    def once(self) -> int:
+        return bits_from_bytes(self.attended_bits)
+
+    @property
+    def twice(self) -> int:
+        return bits_from_bytes(self.attended_twice_bits)
+
+    def count_for(self, event_id: int) -> int:
+        return int((self.event_counts or {}).get(str(event_id), 0))
+
+    def __str__(self) -> str:
+        return f"{self.email} ({self.events_attended} Events)"
+
+
+class EventStatsManager(models.Manager):
+    COUNTER_FIELDS = ("revenue", "tickets", "participants", "orphans", "unpaid")
+
+    def apply_deltas(self, deltas: dict[int, dict[str, object]]) -> None:
+        """
+        Addiert Deltas pro Event ({event_id: {"tickets": 1, "revenue": Decimal(...)}}).
+        """
+        now = timezone.now()
+        with transaction.atomic(savepoint=False):
+            for event_id, delta in deltas.items():
+                changes = {f: v for f, v in delta.items() if v}
+                if not event_id or not changes:
+                    continue
+                updates = {f: models.F(f) + v for f, v in changes.items()}
+                if not self.filter(event_id=event_id).update(updated_at=now, **updates):
+                    self.get_or_create(event_id=event_id)
+                    self.filter(event_id=event_id).update(updated_at=now, **updates)
+
+    def rebuild(self, event_ids=None) -> int:
+        """
+        Berechnet die Statistik komplett neu (alle Events oder nur `event_ids`).
+        """
+        events = Event.objects.all()
+        participants = Participant.objects.all()
+        tickets = Ticket.objects.all()
+        if event_ids is not None:
+            event_ids = {e for e in event_ids if e}
+            events = events.filter(id__in=event_ids)
+            participants = participants.filter(event_id__in=event_ids)
+            tickets = tickets.filter(event_id__in=event_ids)
+
+        rows = {event_id: self.model(event_id=event_id) for event_id in events.values_list("id", flat=True)}
+
+        for row in (
+            participants.values("event_id")
+            .annotate(
+                n=models.Count("pk"),
+                total=models.Sum("amount"),
+                no_ticket=models.Count("pk", filter=models.Q(ticket__isnull=True)),
+            )
+        ):
+            if row["event_id"] in rows:
+                stats = rows[row["event_id"]]
+                stats.participants = row["n"]
+                stats.revenue = row["total"] or Decimal("0.00")
+                stats.orphans = row["no_ticket"]
+
+        for row in (
+            tickets.values("event_id")
+            .annotate(
+                n=models.Count("pk"),
+                open=models.Count("pk", filter=models.Q(participant__isnull=True)),
+            )
+        ):
+            if row["event_id"] in rows:
+                stats = rows[row["event_id"]]
+                stats.tickets = row["n"]
+                stats.unpaid = row["open"]
+
+        with transaction.atomic():
+            if event_ids is None:
+                self.all().delete()
+            else:
+                self.filter(event_id__in=event_ids).delete()
+            self.bulk_create(rows.values(), batch_size=500)
+        return len(rows)
+
+    def rows(self) -> list["EventStats"]:
+        """
+        Eine Zeile pro Event (neueste zuerst); fehlende Statistik zählt als 0.
+        """
+        result = []
+        for event in Event.objects.select_related("stats").order_by("-date", "name"):
+            try:
+                stats = event.stats
+            except EventStats.DoesNotExist:
+                stats = self.model(event=event)
+            result.append(stats)
+        return result
+
+
+class EventStats(models.Model):
+    """
+    Rollup pro Event für das Dashboard.
+    Wird inkrementell über Ticket/Participant-Signals gepflegt (siehe gfm.rollups),
+    Neuaufbau: `python manage.py rebuild_rollups`.
+    """
+
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    tickets = models.IntegerField(default=0)
+    participants = models.IntegerField(default=0)
+    orphans = models.IntegerField(default=0)  # Participants ohne Ticket
+    unpaid = models.IntegerField(default=0)  # Tickets ohne Participant
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventStatsManager()
+
+    def __str__(self) -> str:
+        return f"Statistik {self.event}"
+
+
+class CounterRollupManager(models.Manager):
+    """
+    Gemeinsame Delta-Logik für Rollup-Tabellen mit eindeutigem Schlüssel.
+    """
+
+    def apply_delta(self, lookup: dict, delta: dict) -> None:
+        changes = {f: v for f, v in delta.items() if v}
+        if not changes:
+            return
+        updates = {f: models.F(f) + v for f, v in changes.items()}
+        # Teil der laufenden Schreib-Transaktion, ohne eigenen Savepoint
+        with transaction.atomic(savepoint=False):
+            if not self.filter(**lookup).update(**updates):
+                self.get_or_create(**lookup)
+                self.filter(**lookup).update(**updates)
+
+
+def checkin_bucket_start(dt):
+    """
+    Beginn des 15-Minuten-Fensters (lokale Zeit) für einen Zeitpunkt.
+    """
+    local = timezone.localtime(dt)
+    return local.replace(minute=local.minute - local.minute % CheckinBucket.BUCKET_MINUTES, second=0, microsecond=0)
+
+
+class CheckinBucketManager(CounterRollupManager):
+    def rebuild(self) -> int:
+        buckets: dict[tuple, list] = {}
+        rows = Participant.objects.values_list("event_id", "created_at", "amount")
+        for event_id, created_at, amount in rows.iterator(chunk_size=2000):
+            b = buckets.setdefault((event_id, checkin_bucket_start(created_at)), [0, Decimal("0.00")])
+            b[0] += 1
+            b[1] += amount or Decimal("0.00")
+
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                [
+                    self.model(event_id=event_id, bucket_start=start, checkins=n, revenue=revenue)
+                    for (event_id, start), (n, revenue) in buckets.items()
+                ],
+                batch_size=500,
+            )
+        return len(buckets)
+
+
+class CheckinBucket(models.Model):
+    """
+    Check-ins (angelegte Participants) und Umsatz pro Event und 15-Minuten-Fenster.
+    """
+
+    BUCKET_MINUTES = 15
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="checkin_buckets")
+    bucket_start = models.DateTimeField()
+    checkins = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+
+    objects = CheckinBucketManager()
+
+    class Meta:
+        ordering = ["bucket_start"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "bucket_start"], name="uniq_checkin_bucket_per_event"),
+        ]
+
+
+class DailyRevenueManager(CounterRollupManager):
+    def rebuild(self) -> int:
+        rows = (
+            Participant.objects.filter(paid_at__isnull=False)
+            .values("paid_at")
+            .annotate(n=models.Count("pk"), total=models.Sum("amount"))
+        )
+        objs = [
+            self.model(day=row["paid_at"], participants=row["n"], revenue=row["total"] or Decimal("0.00"))
+            for row in rows
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(objs, batch_size=500)
+        return len(objs)
+
+    def cumulative(self, date_from=None, date_to=None) -> list[tuple]:
+        """
+        [(tag, umsatz kumuliert)] im Zeitraum; Startwert = Umsatz vor `date_from`.
+        """
+        qs = self.all()
+        running = Decimal("0.00")
+        if date_from:
+            running = self.filter(day__lt=date_from).aggregate(s=models.Sum("revenue"))["s"] or Decimal("0.00")
+            qs = qs.filter(day__gte=date_from)
+        if date_to:
+            qs = qs.filter(day__lte=date_to)
+
+        result = []
+        for day, revenue in qs.order_by("day").values_list("day", "revenue"):
+            running += revenue
+            result.append((day, running))
+        return result
+
+
+class DailyRevenue(models.Model):
+    """
+    Umsatz und bezahlte Teilnahmen pro Zahltag (paid_at).
+    """
+
+    day = models.DateField(primary_key=True)
+    participants = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+
+    objects = DailyRevenueManager()
+
+    class Meta:
+        ordering = ["day"]
+
+
+class CacheVersionManager(models.Manager):
+    def current(self) -> dict[str, int]:
+        return dict(self.values_list("namespace", "version"))
+
+    def bump(self, namespaces) -> None:
+        namespaces = set(namespaces)
+        # Läuft nach dem Commit (gfm.cache.bump): ein einzelnes UPDATE, keine eigene Transaktion
+        updated = self.filter(namespace__in=namespaces).update(version=models.F("version") + 1)
+        if updated < len(namespaces):
+            # Namespace zum ersten Mal gebumpt -> Zeile anlegen (vorhandene bleiben)
+            self.bulk_create([self.model(namespace=ns, version=1) for ns in namespaces], ignore_conflicts=True)
+
+    def advance(self, namespace: str) -> int:
+        """
+        Zählt `namespace` innerhalb der laufenden Transaktion hoch und liefert den neuen Stand.
+        """
+        if not self.filter(namespace=namespace).update(version=models.F("version") + 1):
+            self.bulk_create([self.model(namespace=namespace)], ignore_conflicts=True)
+            self.filter(namespace=namespace).update(version=models.F("version") + 1)
+        return self.filter(namespace=namespace).values_list("version", flat=True).get()
+
+
+class CacheVersion(models.Model):
+    """
+    Versionszähler pro Cache-Namespace: Invalidierungs-Bus zwischen den Worker-Prozessen.
+    Jeder Worker liest die (wenigen) Zeilen einmal pro Request, siehe gfm.cache.
+    """
+
+    namespace = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    objects = CacheVersionManager()
+
+    def __str__(self) -> str:
+        return f"{self.namespace}@{self.version}"
+
+
+class RollingLogManager(models.Manager):
+    """
+    Rollierendes Log: nach jedem Eintrag nur die letzten KEEP behalten.
+    """
+
+    KEEP = 500
+
+    def record(self, **fields):
+        entry = self.create(**fields)
+        self.filter(pk__lte=entry.pk - self.KEEP).delete()
+        return entry
+
+
+class SlowRequest(models.Model):
+    """
+    Request über settings.GFM_PERF_SLOW_MS, geschrieben von gfm.perf.PerformanceMiddleware.
+    `top_sql`: die teuersten Abfragen (SQL mit Platzhaltern, Anzahl, Gesamtzeit in ms).
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    db_ms = models.FloatField()
+    queries = models.PositiveIntegerField()
+    template_ms = models.FloatField()
+    top_sql = models.JSONField(default=list)
+
+    objects = RollingLogManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class RequestProfileManager(RollingLogManager):
+    # Profile sind groß (marshal-Dump aller Funktionen)
+    KEEP = 50
+
+
+class RequestProfile(models.Model):
+    """
+    cProfile-Aufzeichnung eines einzelnen Requests, angefordert von Staff
+    (gfm.perf.ProfileMiddleware). `stats` ist der marshal-Dump wie in einer .pstats-Datei.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey("gfm.User", null=True, blank=True, on_delete=models.SET_NULL)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    db_ms = models.FloatField(null=True, blank=True)
+    queries = models.PositiveIntegerField(null=True, blank=True)
+    stats = models.BinaryField()
+
+    objects = RequestProfileManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -403,6 +1030,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    def get_session_auth_hash(self):
+        # Gecachte User (gfm.auth) kommen ohne Passwort-Hash, aber mit dem daraus
+        # abgeleiteten Session-Hash; ist das Passwort geladen/gesetzt, gilt es selbst.
+        cached = self.__dict__.get("_cached_session_auth_hash")
+        if cached is not None and "password" not in self.__dict__:
+            return cached
+        return super().get_session_auth_hash()
+
     class Meta:
         ordering = ['last_name', 'first_name']
         verbose_name = 'Benutzer'
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from gfm import cache
+from gfm.models import Event, Participant, Ticket, email_iexact
+
+SUMMARY_TIMEOUT = 15 * 60
+
+_events = cache.LocalMemo("events", cache.EVENTS)
+
+
+@dataclass(frozen=True)
+class TicketVM:
+    ticket: Ticket
+    checked: bool
+
+
+@dataclass(frozen=True)
+class TicketGroupVM:
+    event: object  # Event
+    tickets: list[TicketVM]
+
+
+@dataclass(frozen=True)
+class NoTicketEventVM:
+    event: object
+    checked: bool
+
+
+@dataclass(frozen=True)
+class ParticipationSummary:
+    """
+    Vorberechnete Teilnahme-Übersicht für genau eine E-Mail.
+    """
+
+    email: str
+    ticket_groups: list[TicketGroupVM]
+    no_ticket_events: list[NoTicketEventVM]
+    tickets: list[Ticket]
+    events: list[Event]
+
+
+def _summary_parts(email: str) -> tuple:
+    digest = hashlib.sha1((email or "").strip().lower().encode("utf-8")).hexdigest()
+    return ("summary", digest)
+
+
+def build_participation_summary(email: str) -> ParticipationSummary:
+    """
+    Baut die Übersicht direkt aus der DB (ohne Cache).
+    """
+    events = _events.get_or_set("all", lambda: list(Participant.objects.events_all()))
+    tickets = list(Participant.objects.tickets_for_email(email))
+
+    # Prechecked: vorhandene Participants
+    checked_ticket_ids = set(
+        Participant.objects.filter(email_iexact(email), ticket__isnull=False)
+        .values_list("ticket_id", flat=True)
+    )
+    checked_no_ticket_event_ids = set(
+        Participant.objects.filter(email_iexact(email), ticket__isnull=True)
+        .values_list("event_id", flat=True)
+    )
+
+    # Tickets nach Event gruppieren
+    tickets_by_event_id: dict[int, list[Ticket]] = {}
+    for t in tickets:
+        tickets_by_event_id.setdefault(t.event_id, []).append(t)
+
+    ticket_groups: list[TicketGroupVM] = []
+    for e in events:
+        if e.id not in tickets_by_event_id:
+            continue
+        ticket_groups.append(
+            TicketGroupVM(
+                event=e,
+                tickets=[TicketVM(ticket=t, checked=(t.ticket_uuid in checked_ticket_ids)) for t in
+                         tickets_by_event_id[e.id]],
+            )
+        )
+
+    # No-ticket Events: NUR dort anzeigen, wo es KEINE Tickets zur Email für dieses Event gibt
+    no_ticket_events: list[NoTicketEventVM] = []
+    for e in events:
+        if e.id in tickets_by_event_id:
+            continue
+        no_ticket_events.append(
+            NoTicketEventVM(event=e, checked=(e.id in checked_no_ticket_event_ids))
+        )
+
+    return ParticipationSummary(
+        email=email,
+        ticket_groups=ticket_groups,
+        no_ticket_events=no_ticket_events,
+        tickets=tickets,
+        events=events,
+    )
+
+
+def get_participation_summary(email: str) -> ParticipationSummary:
+    """
+    Liefert die Übersicht aus dem Cache (ein Roundtrip) oder baut sie neu.
+    Event-Änderungen machen alle Übersichten ungültig (Namespace-Bump, gfm.cache).
+    """
+    return cache.get_or_set(
+        cache.PARTICIPATION,
+        _summary_parts(email),
+        lambda: build_participation_summary(email),
+        timeout=SUMMARY_TIMEOUT,
+    )
+
+
+def invalidate_participation_summary(*emails: str) -> None:
+    """
+    Löscht die Übersichten erst nach dem Commit: vorher könnte ein anderer Worker
+    den alten Stand für SUMMARY_TIMEOUT erneut cachen.
+    """
+    parts = {_summary_parts(e) for e in emails if e}
+    if parts:
+        transaction.on_commit(lambda: cache.delete(cache.PARTICIPATION, *parts))
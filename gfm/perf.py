@@ -0,0 +1,315 @@
+"""
+Performance-Messung pro Request (PerformanceMiddleware).
+
+- Gesamtzeit, DB-Zeit, Anzahl Abfragen und Template-Renderzeit, ausgegeben als
+  `Server-Timing`-Header (Browser-Devtools) und als JSON-Zeile im Log `gfm.perf`.
+- Requests ab settings.GFM_PERF_SLOW_MS landen samt der teuersten Abfragen in
+  SlowRequest (Admin, nur Staff); ältere Einträge werden laufend verworfen.
+
+Gemessen wird über eine ContextVar: DB-Abfragen (execute_wrapper auf jeder
+Verbindung) und Templates (TimedDjangoTemplates) zählen nur, solange ein Request
+läuft – auch in den Threads async Views. Mit GFM_PERF=0 nimmt sich die Middleware
+aus der Kette, übrig bleibt ein Blick auf die ContextVar pro Abfrage.
+
+Auf Abruf (nur Staff, `?_profile=1` oder Header `X-GFM-Profile: 1`) läuft ein
+einzelner Request unter cProfile (ProfileMiddleware); das Ergebnis liegt in
+RequestProfile (Admin: Top-N-Tabellen, Download als .pstats).
+
+Dieselben Messwerte gehen als Histogramme/Zähler nach gfm.metrics (/metrics/).
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import marshal
+import pstats
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.template.backends import django as django_backend
+from django.template.backends.django import reraise
+from django.template.exceptions import TemplateDoesNotExist
+from django.urls import reverse
+from django.utils.deprecation import MiddlewareMixin
+
+from gfm import metrics
+
+logger = logging.getLogger("gfm.perf")
+
+# Abfragen pro SlowRequest (nach Gesamtzeit, gleiche SQL mit anderen Parametern zusammengefasst)
+TOP_SQL = 5
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "X-GFM-Profile"
+
+_current: ContextVar = ContextVar("gfm_perf_timings", default=None)
+
+
+@dataclass
+class Timings:
+    total: float = 0.0
+    db: float = 0.0
+    queries: int = 0
+    template: float = 0.0
+    # SQL (mit Platzhaltern) -> [Anzahl, Sekunden]
+    sql: dict[str, list] = field(default_factory=dict)
+    _template_depth: int = 0
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        self.db += seconds
+        self.queries += 1
+        entry = self.sql.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def top_sql(self, n: int = TOP_SQL) -> list[dict]:
+        ranked = sorted(self.sql.items(), key=lambda item: item[1][1], reverse=True)[:n]
+        return [{"sql": sql, "count": count, "ms": round(seconds * 1000, 1)} for sql, (count, seconds) in ranked]
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f"total;dur={self.total * 1000:.1f}",
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template * 1000:.1f}",
+        ])
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+# ---------------------------------------------------------------------------
+# Messpunkte
+# ---------------------------------------------------------------------------
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - started)
+
+
+def _install(connection, **kwargs) -> None:
+    # Verbindungen gibt es pro Thread; beim Wiederverbinden nicht doppelt einhängen
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Verschachtelte Templates (z.B. crispy-Felder) stecken in der Zeit des äußeren
+        timings._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings._template_depth -= 1
+            if not timings._template_depth:
+                timings.template += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(django_backend.DjangoTemplates):
+    """
+    Django-Template-Backend, das die Renderzeit in die laufende Messung schreibt.
+    """
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.GFM_PERF:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(_install, dispatch_uid="gfm_perf_install")
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = Timings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        timings.total = time.perf_counter() - started
+        if self.report(request, response, timings):
+            self.store_slow(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        timings.total = time.perf_counter() - started
+        if self.report(request, response, timings):
+            await sync_to_async(self.store_slow)(request, response, timings)
+        return response
+
+    @staticmethod
+    def view_name(request) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return ""
+        return match.view_name or match._func_path
+
+    def report(self, request, response, timings: Timings) -> bool:
+        """
+        Header und Log schreiben; True = langsamer Request.
+        """
+        response.headers["Server-Timing"] = timings.server_timing()
+        slow = timings.total * 1000 >= settings.GFM_PERF_SLOW_MS
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": self.view_name(request),
+            "status": response.status_code,
+            "total_ms": round(timings.total * 1000, 1),
+            "db_ms": round(timings.db * 1000, 1),
+            "queries": timings.queries,
+            "template_ms": round(timings.template * 1000, 1),
+        }
+        if slow:
+            record["top_sql"] = timings.top_sql()
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record))
+        metrics.observe_request(
+            record["view"], request.method, response.status_code, timings.total, timings.queries, timings.db
+        )
+        return slow
+
+    def store_slow(self, request, response, timings: Timings) -> None:
+        from gfm.models import SlowRequest
+
+        try:
+            SlowRequest.objects.record(
+                method=request.method,
+                path=request.get_full_path()[:500],
+                view=self.view_name(request)[:200],
+                status=response.status_code,
+                duration_ms=timings.total * 1000,
+                db_ms=timings.db * 1000,
+                queries=timings.queries,
+                template_ms=timings.template * 1000,
+                top_sql=timings.top_sql(),
+            )
+        except DatabaseError:
+            # Messung darf den Request nicht kaputt machen (z.B. Tabelle noch nicht migriert)
+            logger.warning("SlowRequest nicht gespeichert", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Profiling auf Abruf
+# ---------------------------------------------------------------------------
+
+def profile_requested(request) -> bool:
+    return bool(request.GET.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER))
+
+
+class ProfileMiddleware(MiddlewareMixin):
+    """
+    Steht am Ende der Kette: process_view läuft nach CSRF & Co. und ruft die View
+    selbst unter cProfile auf, inklusive Rendern einer TemplateResponse.
+
+    Unter ASGI läuft process_view im Thread des Requests (synchrone Views laufen
+    dort ohnehin); async Views laufen über async_to_sync, ihre sync_to_async-Teile
+    (ORM, Berechnungen) kommen damit ebenfalls in diesem Thread an.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not profile_requested(request) or not request.user.is_staff:
+            return None
+        from gfm.models import RequestProfile
+
+        if iscoroutinefunction(view_func):
+            view_func = async_to_sync(view_func)
+        timings = current()
+        db, queries = (timings.db, timings.queries) if timings else (0.0, 0)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+            if callable(getattr(response, "render", None)):
+                response = response.render()
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+        profiler.create_stats()
+
+        entry = RequestProfile.objects.record(
+            user=request.user,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view=PerformanceMiddleware.view_name(request)[:200],
+            status=response.status_code,
+            duration_ms=duration * 1000,
+            db_ms=(timings.db - db) * 1000 if timings else None,
+            queries=timings.queries - queries if timings else None,
+            stats=marshal.dumps(profiler.stats),
+        )
+        response.headers[PROFILE_HEADER] = reverse("admin:gfm_requestprofile_change", args=[entry.pk])
+        return response
+
+
+def load_stats(data: bytes) -> pstats.Stats:
+    # wie pstats.Stats(<datei>), nur aus dem gespeicherten Dump
+    stats = pstats.Stats()
+    stats.stats = marshal.loads(bytes(data))
+    stats.get_top_level_stats()
+    return stats
+
+
+def top_functions(data: bytes, sort: str = "cumulative", limit: int = 30) -> list[dict]:
+    """
+    Top-N-Funktionen (sort: "cumulative" oder "tottime") als Zeilen für die Anzeige.
+    """
+    stats = load_stats(data).sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive, calls, tottime, cumtime, _callers = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            "function": pstats.func_std_string(func) if filename == "~" else f"{filename}:{line}({name})",
+            "calls": calls if calls == primitive else f"{calls}/{primitive}",
+            "tottime_ms": round(tottime * 1000, 2),
+            "cumtime_ms": round(cumtime * 1000, 2),
+        })
+    return rows
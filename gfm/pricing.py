@@ -0,0 +1,138 @@
+"""
+Preise und Serien-Rabatte (einzige Quelle für Formular, Dashboard und Quote-Endpoint).
+
+Regeln:
+- Teilnahme mit Ticket: PRICE_TICKET, ohne Ticket: PRICE_NO_TICKET
+- Serien-Bonus: nach der Auswahl bei allen Events dabei -> günstigste neue Position gratis
+- Doppel-Bonus: bei allen Events mindestens zweimal dabei -> zwei günstigste neue Positionen gratis
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from gfm.attendance import AttendanceStatus, get_index as get_attendance_index, status_for_bits
+from gfm.models import event_bits
+
+PRICE_TICKET = Decimal("23.00")
+PRICE_NO_TICKET = Decimal("28.00")
+
+KIND_TICKET = "ticket"
+KIND_NO_TICKET = "no_ticket"
+
+PRICES = {
+    KIND_TICKET: PRICE_TICKET,
+    KIND_NO_TICKET: PRICE_NO_TICKET,
+}
+
+
+def price_for(kind: str) -> Decimal:
+    return PRICES[kind]
+
+
+@dataclass(frozen=True)
+class QuoteItem:
+    kind: str
+    event_id: int
+
+    @property
+    def price(self) -> Decimal:
+        return price_for(self.kind)
+
+
+@dataclass(frozen=True)
+class Quote:
+    items: list[QuoteItem] = field(default_factory=list)
+    regular: Decimal = Decimal("0.00")
+    discount: Decimal = Decimal("0.00")
+    discount_label: str = ""
+    series_complete: bool = False
+    double_series_complete: bool = False
+
+    @property
+    def total(self) -> Decimal:
+        return self.regular - self.discount
+
+    def as_dict(self) -> dict:
+        return {
+            "items": [{"kind": i.kind, "event_id": i.event_id, "price": str(i.price)} for i in self.items],
+            "regular": str(self.regular),
+            "discount": str(self.discount),
+            "total": str(self.total),
+            "discount_label": self.discount_label,
+            "series_complete": self.series_complete,
+            "double_series_complete": self.double_series_complete,
+        }
+
+
+def free_items(status: AttendanceStatus) -> int:
+    """
+    Anzahl Gratis-Positionen (0, 1 oder 2).
+    """
+    if status.attended_all_twice:
+        return 2
+    if status.attended_all:
+        return 1
+    return 0
+
+
+def quote(*, season_mask: int, once: int, twice: int, items: list[QuoteItem]) -> Quote:
+    """
+    Preis für neue Positionen `items`, ausgehend von den bereits gebuchten Teilnahmen
+    als Bitsets (`once`/`twice`). `season_mask` enthält alle Events der Saison.
+    """
+    if not items:
+        return Quote()
+
+    new_counts = Counter(item.event_id for item in items)
+    new_once = event_bits(new_counts)
+    new_twice = event_bits(e for e, n in new_counts.items() if n >= 2)
+
+    n_free = free_items(status_for_bits(
+        season_mask,
+        once | new_once,
+        twice | (once & new_once) | new_twice,
+    ))
+    prices = sorted(item.price for item in items)
+    discount = sum(prices[:n_free], Decimal("0.00"))
+
+    label = ""
+    if n_free == 2:
+        label = "Doppel-Bonus: 2 Plätze gratis!"
+    elif n_free == 1:
+        label = "Serien-Bonus: 1x gratis!"
+
+    return Quote(
+        items=list(items),
+        regular=sum(prices, Decimal("0.00")),
+        discount=discount,
+        discount_label=label,
+        series_complete=n_free >= 1,
+        double_series_complete=n_free >= 2,
+    )
+
+
+def quote_for_email(email: str, *, items: list[QuoteItem], event_ids: Optional[Iterable[int]] = None) -> Quote:
+    """
+    Quote für eine E-Mail; bereits gebuchte Teilnahmen kommen als Bitsets aus dem
+    Attendance-Index (im Speicher, ohne Abfrage pro Person).
+    """
+    index = get_attendance_index()
+    once, twice = index.bits(email)
+    return quote(
+        season_mask=event_bits(event_ids) if event_ids is not None else index.season_mask,
+        once=once,
+        twice=twice,
+        items=items,
+    )
+
+
+def season_discount() -> tuple[int, Decimal]:
+    """
+    (Anzahl E-Mails mit Serien-Bonus, Rabattvolumen der Saison) aus dem Attendance-Index.
+    Bewertet wird jede Gratis-Position mit dem günstigsten Preis (PRICE_TICKET).
+    """
+    eligible, double = get_attendance_index().season_totals()
+    return eligible, (eligible + double) * PRICE_TICKET
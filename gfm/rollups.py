@@ -0,0 +1,94 @@
+"""
+Inkrementelle Pflege der Rollups (EventStats, CheckinBucket, DailyRevenue).
+
+Jedes Ticket / jeder Participant "trägt" einen Beitrag zu den Zählern seines Events bei.
+Bei Änderungen wird (neuer Beitrag - alter Beitrag) auf die Rollups addiert.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Optional
+
+from gfm.models import CheckinBucket, DailyRevenue, EventStats, checkin_bucket_start
+
+Deltas = dict[object, dict[str, object]]  # Schlüssel: event_id bzw. Tupel (Zeit-Rollups)
+
+
+def _empty() -> Deltas:
+    return defaultdict(lambda: defaultdict(int))
+
+
+def ticket_contribution(*, event_id: Optional[int]) -> Deltas:
+    d = _empty()
+    if event_id:
+        d[event_id]["tickets"] += 1
+        d[event_id]["unpaid"] += 1
+    return d
+
+
+def participant_contribution(
+        *,
+        event_id: Optional[int],
+        amount: Optional[Decimal],
+        ticket_event_id: Optional[int],
+) -> Deltas:
+    """
+    Ein verknüpfter Participant macht das Ticket (im Event des Tickets) "bezahlt".
+    """
+    d = _empty()
+    if not event_id:
+        return d
+    d[event_id]["participants"] += 1
+    d[event_id]["revenue"] += amount or Decimal("0.00")
+    if ticket_event_id:
+        d[ticket_event_id]["unpaid"] -= 1
+    else:
+        d[event_id]["orphans"] += 1
+    return d
+
+
+def diff(new: Deltas, old: Deltas) -> Deltas:
+    d = _empty()
+    for event_id, fields in new.items():
+        for f, v in fields.items():
+            d[event_id][f] += v
+    for event_id, fields in old.items():
+        for f, v in fields.items():
+            d[event_id][f] -= v
+    return d
+
+
+def apply(deltas: Deltas) -> None:
+    EventStats.objects.apply_deltas(deltas)
+
+
+def participant_time_contribution(
+        *,
+        event_id: Optional[int],
+        created_at,
+        paid_at,
+        amount: Optional[Decimal],
+) -> Deltas:
+    """
+    Schlüssel: ("checkin", event_id, bucket_start) bzw. ("daily", paid_at).
+    """
+    d = _empty()
+    amount = amount or Decimal("0.00")
+    if event_id and created_at:
+        key = ("checkin", event_id, checkin_bucket_start(created_at))
+        d[key]["checkins"] += 1
+        d[key]["revenue"] += amount
+    if paid_at:
+        key = ("daily", paid_at)
+        d[key]["participants"] += 1
+        d[key]["revenue"] += amount
+    return d
+
+
+def apply_time(deltas: Deltas) -> None:
+    for key, fields in deltas.items():
+        if key[0] == "checkin":
+            CheckinBucket.objects.apply_delta({"event_id": key[1], "bucket_start": key[2]}, fields)
+        elif key[0] == "daily":
+            DailyRevenue.objects.apply_delta({"day": key[1]}, fields)
@@ -1,8 +1,72 @@
+from django.contrib.auth.models import Group
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 
-from .models import Participant, Ticket
+from . import cache, rollups
+from .cache import USERS, bump, bump_for_model
+from .db import apply_pragmas
+from .models import EmailEntitlement, Event, Participant, Ticket, User, email_iexact
+from .participation import invalidate_participation_summary
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    SQLite-Profil (WAL, busy_timeout, ...) für jede neue Datenbankverbindung.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
+
+
+# Alter Stand, gegen den post_save/post_delete die Rollup-Deltas rechnen
+TICKET_PREVIOUS_FIELDS = ("email", "event_id", "participant__id")
+PARTICIPANT_PREVIOUS_FIELDS = ("email", "event_id", "amount", "paid_at", "ticket_id", "ticket__event_id", "created_at")
+
+
+def _read_previous(sender, pk, fields) -> dict | None:
+    """
+    Stand der Zeile in der DB, gelesen in der laufenden Schreib-Transaktion
+    (SQLite: BEGIN IMMEDIATE, PostgreSQL: Zeilensperre). Nicht der Stand beim
+    Laden des Objekts: ein veraltetes Objekt würde sonst falsche Deltas buchen.
+    """
+    return sender.objects.select_for_update(of=("self",)).filter(pk=pk).values(*fields).first()
+
+
+def _remember_previous(sender, instance, fields):
+    """
+    Merkt sich den gespeicherten Stand (vor dem Update) am Objekt,
+    damit post_save auch den alten Zustand kennt (z.B. geänderte E-Mail).
+    """
+    instance._gfm_previous = None
+    if instance.pk is None or (instance._state.adding and instance._meta.pk.has_default()):
+        # wird eingefügt (mit pk-Default erzwingt Django das INSERT)
+        return
+    instance._gfm_previous = _read_previous(sender, instance.pk, fields)
+
+
+def _previous(instance) -> dict:
+    return getattr(instance, "_gfm_previous", None) or {}
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_previous_ticket(sender, instance: Ticket, **kwargs):
+    _remember_previous(sender, instance, TICKET_PREVIOUS_FIELDS)
+
+
+@receiver(pre_save, sender=Participant)
+def remember_previous_participant(sender, instance: Participant, **kwargs):
+    _remember_previous(sender, instance, PARTICIPANT_PREVIOUS_FIELDS)
+
+
+@receiver(pre_delete, sender=Participant)
+def remember_deleted_participant(sender, instance: Participant, **kwargs):
+    # läuft im atomic-Block von delete(): abgezogen wird, was tatsächlich gelöscht wird
+    instance._gfm_previous = _read_previous(sender, instance.pk, PARTICIPANT_PREVIOUS_FIELDS)
 
 
 @receiver(post_save, sender=Ticket)
@@ -16,8 +80,8 @@ def autolink_participant_on_ticket_save(sender, instance: Ticket, created: bool,
             Participant.objects
             .select_for_update()
             .filter(
+                email_iexact(instance.email),
                 event_id=instance.event_id,
-                email__iexact=instance.email,
                 ticket__isnull=True,
             )
             .order_by("-created_at")
@@ -26,3 +90,182 @@ def autolink_participant_on_ticket_save(sender, instance: Ticket, created: bool,
         if p:
             p.ticket = instance
             p.save(update_fields=["ticket", "updated_at"])
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_save, sender=Participant)
+def invalidate_participation_on_save(sender, instance, **kwargs):
+    invalidate_participation_summary(instance.email, _previous(instance).get("email"))
+
+
+@receiver(post_delete, sender=Ticket)
+@receiver(post_delete, sender=Participant)
+def invalidate_participation_on_delete(sender, instance, **kwargs):
+    invalidate_participation_summary(instance.email)
+
+
+def _ticket_event_id(participant: Participant):
+    # immer aus der DB: ein mitgeladenes participant.ticket kann inzwischen umgezogen sein
+    if not participant.ticket_id:
+        return None
+    return Ticket.objects.filter(pk=participant.ticket_id).values_list("event_id", flat=True).first()
+
+
+def _participant_state(participant: Participant, **overrides) -> dict:
+    state = {
+        "email": participant.email,
+        "event_id": participant.event_id,
+        "amount": participant.amount,
+        "paid_at": participant.paid_at,
+        "ticket_id": participant.ticket_id,
+        "created_at": participant.created_at,
+    }
+    state.update(overrides)
+    return state
+
+
+def _stored_participant_state(prev: dict) -> dict | None:
+    if not prev:
+        return None
+    state = dict(prev)
+    state["ticket_event_id"] = state.pop("ticket__event_id")
+    return state
+
+
+def _contributions(state: dict | None) -> tuple[rollups.Deltas, rollups.Deltas]:
+    if state is None:
+        return {}, {}
+    return (
+        rollups.participant_contribution(
+            event_id=state["event_id"], amount=state["amount"], ticket_event_id=state["ticket_event_id"],
+        ),
+        rollups.participant_time_contribution(
+            event_id=state["event_id"], created_at=state["created_at"], paid_at=state["paid_at"],
+            amount=state["amount"],
+        ),
+    )
+
+
+def _entitlement_key(state: dict | None):
+    return (state["email"].strip().lower(), state["event_id"]) if state else None
+
+
+def _apply_participant_change(new: dict | None, old: dict | None) -> None:
+    """
+    Alle Folgeschreibvorgänge einer Teilnahme in einem Schritt, innerhalb der
+    Schreib-Transaktion und ohne eigene Savepoints:
+    - updated_at der (alten und neuen) Tickets, damit die Live-Liste die Zeile
+      als geändert ausliefert (der Bezahlstatus kommt vom Participant)
+    - EmailEntitlement, nur wenn sich (E-Mail, Event) ändert
+    - EventStats, CheckinBucket und DailyRevenue mit (neuer - alter Beitrag)
+    """
+    ticket_ids = {state["ticket_id"] for state in (new, old) if state} - {None}
+    new_stats, new_time = _contributions(new)
+    old_stats, old_time = _contributions(old)
+    new_key, old_key = _entitlement_key(new), _entitlement_key(old)
+
+    with transaction.atomic(savepoint=False):
+        if ticket_ids:
+            Ticket.objects.filter(pk__in=ticket_ids).update(updated_at=timezone.now())
+        if new_key != old_key:
+            if old_key:
+                EmailEntitlement.objects.apply(*old_key, -1)
+            if new_key:
+                EmailEntitlement.objects.apply(*new_key, +1)
+        rollups.apply(rollups.diff(new_stats, old_stats))
+        rollups.apply_time(rollups.diff(new_time, old_time))
+
+
+@receiver(post_save, sender=Participant)
+def update_rollups_on_participant_save(sender, instance: Participant, created: bool, **kwargs):
+    new = _participant_state(instance, ticket_event_id=_ticket_event_id(instance))
+    old = None if created else _stored_participant_state(_previous(instance))
+    if not created and old is None:
+        # alter Stand unbekannt: Rollups nicht anfassen, nur das Ticket als geändert markieren
+        if instance.ticket_id:
+            Ticket.objects.filter(pk=instance.ticket_id).update(updated_at=timezone.now())
+        return
+    _apply_participant_change(new, old)
+
+
+@receiver(post_delete, sender=Participant)
+def update_rollups_on_participant_delete(sender, instance: Participant, **kwargs):
+    old = _stored_participant_state(_previous(instance))
+    if old is not None:
+        _apply_participant_change(None, old)
+
+
+@receiver(post_save, sender=Ticket)
+def update_event_stats_on_ticket_save(sender, instance: Ticket, created: bool, **kwargs):
+    if created:
+        rollups.apply(rollups.ticket_contribution(event_id=instance.event_id))
+        return
+
+    prev = _previous(instance)
+    if not prev or prev["event_id"] == instance.event_id:
+        return
+
+    deltas = rollups.diff(
+        rollups.ticket_contribution(event_id=instance.event_id),
+        rollups.ticket_contribution(event_id=prev["event_id"]),
+    )
+    if prev.get("participant__id"):
+        # Bereits verknüpfter Participant: "bezahlt" wandert mit dem Ticket
+        deltas[prev["event_id"]]["unpaid"] += 1
+        deltas[instance.event_id]["unpaid"] -= 1
+    rollups.apply(deltas)
+
+
+@receiver(pre_delete, sender=Ticket)
+def remember_linked_participant_on_ticket_delete(sender, instance: Ticket, **kwargs):
+    # Participant.ticket ist SET_NULL -> wird per UPDATE (ohne Signal) entkoppelt
+    instance._gfm_linked_participant_event_id = (
+        Participant.objects.filter(ticket_id=instance.pk).values_list("event_id", flat=True).first()
+    )
+
+
+@receiver(post_delete, sender=Ticket)
+def update_event_stats_on_ticket_delete(sender, instance: Ticket, **kwargs):
+    deltas = rollups.diff({}, rollups.ticket_contribution(event_id=instance.event_id))
+    linked_event_id = getattr(instance, "_gfm_linked_participant_event_id", None)
+    if linked_event_id:
+        deltas[instance.event_id]["unpaid"] += 1
+        deltas[linked_event_id]["orphans"] += 1
+    rollups.apply(deltas)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_save, sender=Participant)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Ticket)
+@receiver(post_delete, sender=Participant)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_cache_namespaces_on_write(sender, instance, **kwargs):
+    bump_for_model(sender)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, update_fields=None, **kwargs):
+    """
+    Nur die Einträge dieses Users verwerfen (gfm.auth), nach dem Commit. Ein Bump von
+    USERS würde bei jedem Login alle User, Rechte und Listen-ETags ungültig machen.
+    """
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        # update_last_login: nichts, was Rechte oder Anzeige betrifft
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: cache.delete(USERS, (pk,), ("perms", pk)))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def bump_users_on_permission_change(sender, action, **kwargs):
+    """
+    Gruppen/Rechte stecken im gecachten User (gfm.auth).
+    """
+    if action.startswith("post_"):
+        bump(USERS)
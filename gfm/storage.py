@@ -0,0 +1,66 @@
+"""
+Static-Files-Storage für den Betrieb: gehashte Dateinamen (ManifestStaticFilesStorage)
+plus vorkomprimierte .gz/.br-Varianten, geschrieben bei `collectstatic`.
+
+nginx liefert die Varianten direkt aus (gzip_static/brotli_static, siehe README).
+Brotli ist optional (Paket `brotli`); ohne wird nur gzip geschrieben.
+"""
+from __future__ import annotations
+
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional, dann nur .gz
+    brotli = None
+
+# Textformate; Bilder und woff/woff2 sind bereits komprimiert
+COMPRESS_EXTENSIONS = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html", ".xml", ".ttf", ".eot"}
+COMPRESS_MIN_SIZE = 512
+# Variante nur behalten, wenn sie spürbar kleiner ist
+COMPRESS_MAX_RATIO = 0.9
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0: gleiche Eingabe -> gleiche Bytes (reproduzierbare Builds)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def compressors(self) -> list[tuple[str, object]]:
+        compressors = [(".gz", _gzip)]
+        if brotli is not None:
+            compressors.append((".br", _brotli))
+        return compressors
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Nur die gehashten Namen: auf die verweisen die Templates. Der Hash steht für
+        # den Inhalt, vorhandene Varianten aus früheren Läufen bleiben also gültig.
+        for name in sorted(set(self.hashed_files.values())):
+            if os.path.splitext(name)[1].lower() in COMPRESS_EXTENSIONS:
+                self.compress(name)
+
+    def compress(self, name: str) -> None:
+        data = None
+        for suffix, compress in self.compressors():
+            if self.exists(name + suffix):
+                continue
+            if data is None:
+                with self.open(name) as f:
+                    data = f.read()
+                if len(data) < COMPRESS_MIN_SIZE:
+                    return
+            compressed = compress(data)
+            if len(compressed) <= len(data) * COMPRESS_MAX_RATIO:
+                self._save(name + suffix, ContentFile(compressed))
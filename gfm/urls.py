@@ -4,7 +4,9 @@ from django.urls import path
 from config.view import HomeView, UnderConstructionView
 from gfm.forms import EmailAuthenticationForm
 from gfm.views import TicketParticipationView, ParticipantsListView, ParticipantNoTicketCreateView, \
-    AnalyticsDashboardView
+    AnalyticsDashboardView, TicketParticipationQuoteView, DashboardKpisView, DashboardEventsView, DashboardChartsView, \
+    SeasonReportView, EventOrphansListView, EventOrphansAutolinkView, EventUnpaidTicketsListView, \
+    ParticipantsDeltaView, TicketsDeltaView, MetricsView
 
 urlpatterns = [
 
@@ -28,7 +30,19 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     # path("register/", RegisterView.as_view(), name="register"),
     path("tickets/<uuid:ticket_uuid>/participation/", TicketParticipationView.as_view(), name="ticket_participation"),
+    path("tickets/<uuid:ticket_uuid>/participation/quote/", TicketParticipationQuoteView.as_view(),
+         name="ticket_participation_quote"),
     path("participants/", ParticipantsListView.as_view(), name="participants_list"),
+    path("participants/delta/", ParticipantsDeltaView.as_view(), name="participants_delta"),
+    path("tickets/delta/", TicketsDeltaView.as_view(), name="tickets_delta"),
     path("participants/new/no-ticket/", ParticipantNoTicketCreateView.as_view(), name="participant_create_no_ticket"),
+    path("events/<int:event_id>/orphans/", EventOrphansListView.as_view(), name="event_orphans"),
+    path("events/<int:event_id>/orphans/autolink/", EventOrphansAutolinkView.as_view(), name="event_orphans_autolink"),
+    path("events/<int:event_id>/unpaid/", EventUnpaidTicketsListView.as_view(), name="event_unpaid"),
     path('dashboard/', AnalyticsDashboardView.as_view(), name='analytics_dashboard'),
+    path('dashboard/api/kpis/', DashboardKpisView.as_view(), name='analytics_dashboard_kpis'),
+    path('dashboard/api/events/', DashboardEventsView.as_view(), name='analytics_dashboard_events'),
+    path('dashboard/api/charts/', DashboardChartsView.as_view(), name='analytics_dashboard_charts'),
+    path('dashboard/season/', SeasonReportView.as_view(), name='analytics_season_report'),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
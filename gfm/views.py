@@ -1,13 +1,24 @@
+import hashlib
+import hmac
+import time
 from dataclasses import dataclass
-from decimal import Decimal
+from datetime import timedelta
 
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin, UserPassesTestMixin
 from django.db import models
-from django.db.models import OuterRef, Exists, Sum, Count, DecimalField, Subquery
-from django.db.models.functions import Coalesce
-from django.shortcuts import get_object_or_404, redirect, render
+from django.db.models import OuterRef, Exists
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.template.loader import render_to_string
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views import View
 from django.views.generic import ListView, TemplateView
 
@@ -17,11 +28,155 @@ from django.views.generic.edit import FormView, CreateView
 
 from .forms import TicketImportForm, ParticipationSelectionForm, ParticipantFilterForm, ParticipantNoTicketCreateForm
 
-from gfm.forms import TicketFilterForm
-from gfm.models import Ticket, Participant, Event
+from gfm.forms import TicketFilterForm, DashboardFilterForm
+from gfm.models import Ticket, Participant, Event, email_iexact
+from gfm import analytics, anomalies, cache, dashboard, metrics, perf
+from gfm.participation import get_participation_summary
+from gfm.pricing import KIND_NO_TICKET, KIND_TICKET, QuoteItem, price_for, quote_for_email
 from gfm.permissions import RequireAdminRoleMixin
 
-import json
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    Login-Pflicht für async Views: der User kommt über request.auser(), synchrone
+    DB-Zugriffe im Event-Loop sind unter ASGI nicht erlaubt.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET für Listen: ETag aus Daten-Stand, Tag (Default-Event = heute),
+    Query-String und Benutzer. Unverändert -> 304 ohne Listen-Abfragen und Template.
+    """
+
+    def list_etag(self, request) -> str | None:
+        if len(messages.get_messages(request)):
+            # Ausstehende Toasts müssen gerendert werden
+            return None
+        return self.data_etag(request)
+
+    def data_etag(self, request) -> str:
+        raw = ":".join(map(str, [
+            type(self).__name__,
+            cache.data_version(),
+            timezone.localdate(),
+            request.user.pk,
+            # Rolle/Rechte und Name ändern die Navigation; Änderungen am einzelnen
+            # User zählen USERS nicht hoch, nur Gruppen und Rechte
+            cache.namespace_version(cache.USERS),
+            request.user.is_superuser,
+            request.user.first_name,
+            # Seite enthält ein CSRF-Token, das zum Cookie passen muss
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+            self.etag_query(request),
+        ]))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def etag_query(self, request) -> str:
+        return request.META.get("QUERY_STRING", "")
+
+    def get(self, request, *args, **kwargs):
+        response = condition(etag_func=self.list_etag)(self.respond)(request, *args, **kwargs)
+        # Browser soll bei jedem Aufruf nachfragen (If-None-Match)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def respond(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+# Mehr geänderte Zeilen -> Client lädt die Seite neu
+LIVE_DELTA_LIMIT = 50
+
+
+def live_overlap() -> timedelta:
+    """
+    Wie lange updated_at vor dem Commit liegen kann: GFM_LIVE_OVERLAP, mindestens aber
+    das SQLite-busy_timeout (so lange wartet ein Schreiber nach dem Setzen von updated_at).
+    """
+    busy_ms = int(getattr(settings, "SQLITE_PRAGMAS", {}).get("busy_timeout", 0))
+    return max(timedelta(seconds=settings.GFM_LIVE_OVERLAP), timedelta(milliseconds=busy_ms + 5000))
+
+
+def live_watermark() -> str:
+    # Zeilen, die vor dem Wasserzeichen geschrieben, aber erst danach committed wurden,
+    # kommen so beim nächsten Abruf noch mit; doppelte verwirft der Client (version)
+    return (timezone.now() - live_overlap()).isoformat()
+
+
+class LiveListMixin:
+    """
+    Liste mit Live-Aktualisierung (static/js/live_list.js): Die Seite bekommt den
+    Delta-Endpoint und ein Wasserzeichen mit, der Browser fragt damit regelmäßig nach.
+    """
+    live_url_name = None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        # Profiling gilt nur für den einen Seitenaufruf, nicht für jede Abfrage danach
+        params.pop(perf.PROFILE_PARAM, None)
+        context["live_url"] = f"{reverse(self.live_url_name)}?{params.urlencode()}"
+        context["live_watermark"] = live_watermark()
+        return context
+
+
+class LiveDeltaMixin(AsyncLoginRequiredMixin):
+    """
+    Delta-Endpoint zu einer Liste (async): gleiche Filter (get_queryset der Liste),
+    aber nur Zeilen mit updated_at > since, fertig gerendert mit dem Zeilen-Template.
+
+    Das ETag ignoriert `since`: solange sich nichts geändert hat, bleibt es gleich
+    und jede Abfrage endet als 304 ohne Listen-Abfrage. Ausstehende Toasts spielen
+    für JSON keine Rolle (data_etag statt list_etag).
+    """
+    row_template = None
+    # JSON-Endpoint: 403 statt Weiterleitung auf die Login-Seite
+    raise_exception = True
+
+    def etag_query(self, request) -> str:
+        params = request.GET.copy()
+        params.pop("since", None)
+        return params.urlencode()
+
+    async def get(self, request, *args, **kwargs):
+        response = await condition(etag_func=self.data_etag)(self.respond)(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    async def respond(self, request, *args, **kwargs):
+        watermark = live_watermark()
+        try:
+            since = parse_datetime(request.GET.get("since", ""))
+        except ValueError:
+            since = None
+
+        # get_queryset sucht ggf. das Default-Event (synchrone Abfrage)
+        qs = await sync_to_async(self.get_queryset)()
+        rows = []
+        if since is not None:
+            changed = qs.filter(updated_at__gt=since).order_by("updated_at")[:LIVE_DELTA_LIMIT + 1]
+            rows = [item async for item in changed]
+
+        return JsonResponse({
+            "watermark": watermark,
+            "total": await qs.acount(),
+            "reload": len(rows) > LIVE_DELTA_LIMIT,
+            "rows": [
+                {
+                    "id": str(item.pk),
+                    "version": item.updated_at.isoformat(),
+                    "html": render_to_string(self.row_template, {"item": item}, request),
+                }
+                for item in rows[:LIVE_DELTA_LIMIT]
+            ],
+        })
 
 
 class TicketMixin(LoginRequiredMixin):
@@ -38,8 +193,9 @@ class TicketMixin(LoginRequiredMixin):
         return context
 
 
-class TicketsListView(TicketMixin, ListView):
+class TicketsListView(TicketMixin, ConditionalListMixin, LiveListMixin, ListView):
     template_name = "tickets/tickets_list.html"
+    live_url_name = "tickets_delta"
     paginate_by = 10
 
     def get_queryset(self):
@@ -91,6 +247,10 @@ class TicketsListView(TicketMixin, ListView):
         return context
 
 
+class TicketsDeltaView(LiveDeltaMixin, TicketsListView):
+    row_template = "tickets/partials/ticket_row.html"
+
+
 class TicketImportView(LoginRequiredMixin, RequireAdminRoleMixin, FormView):
     template_name = "tickets/ticket_import.html"
     form_class = TicketImportForm
@@ -100,8 +260,10 @@ class TicketImportView(LoginRequiredMixin, RequireAdminRoleMixin, FormView):
 
     def form_valid(self, form):
         csv_file = form.cleaned_data["file"]
+        started = time.perf_counter()
         try:
             stats = Ticket.objects.create_from_csv(csv_file)
+            metrics.observe_import("ok", time.perf_counter() - started, stats)
             messages.success(
                 self.request,
                 (
@@ -114,9 +276,11 @@ class TicketImportView(LoginRequiredMixin, RequireAdminRoleMixin, FormView):
             )
             return super().form_valid(form)
         except ValueError as e:
+            metrics.observe_import("error", time.perf_counter() - started)
             form.add_error(None, str(e))
             return self.form_invalid(form)
         except Exception as e:
+            metrics.observe_import("error", time.perf_counter() - started)
             form.add_error(None, f"Unerwarteter Fehler: {str(e)}")
             return self.form_invalid(form)
 
@@ -137,73 +301,28 @@ class EventRowVM:
     no_ticket_checked: bool
 
 
-@dataclass(frozen=True)
-class TicketVM:
-    ticket: Ticket
-    checked: bool
-
-
-@dataclass(frozen=True)
-class TicketGroupVM:
-    event: object  # Event
-    tickets: list[TicketVM]
-
-
-@dataclass(frozen=True)
-class NoTicketEventVM:
-    event: object
-    checked: bool
-
-
-class TicketParticipationView(LoginRequiredMixin, View):
+class TicketParticipationView(AsyncLoginRequiredMixin, View):
+    """
+    Ticket-Scan (async): Nachschlagen über das async ORM; Übersicht, Formular und
+    Speichern laufen synchron in einem Thread (Cache, Signals, Templates).
+    """
     template_name = "tickets/ticket_participation.html"
     success_url = reverse_lazy("tickets_list")
 
     def _build_viewmodel(self, *, email: str):
-        events = list(Participant.objects.events_all())
-        tickets = list(Participant.objects.tickets_for_email(email))
+        # Gecachte Übersicht pro E-Mail (Invalidierung über Ticket/Participant-Signals)
+        summary = get_participation_summary(email)
+        return summary.ticket_groups, summary.no_ticket_events, summary.tickets, summary.events
 
-        # Prechecked: vorhandene Participants
-        checked_ticket_ids = set(
-            Participant.objects.filter(email__iexact=email, ticket__isnull=False)
-            .values_list("ticket_id", flat=True)
-        )
-        checked_no_ticket_event_ids = set(
-            Participant.objects.filter(email__iexact=email, ticket__isnull=True)
-            .values_list("event_id", flat=True)
-        )
+    async def get(self, request, ticket_uuid):
+        source_ticket = await aget_object_or_404(Ticket.objects.select_related("event"), ticket_uuid=ticket_uuid)
+        return await sync_to_async(self._render_selection)(request, source_ticket)
 
-        # Tickets nach Event gruppieren
-        tickets_by_event_id: dict[int, list[Ticket]] = {}
-        for t in tickets:
-            tickets_by_event_id.setdefault(t.event_id, []).append(t)
+    async def post(self, request, ticket_uuid):
+        source_ticket = await aget_object_or_404(Ticket.objects.select_related("event"), ticket_uuid=ticket_uuid)
+        return await sync_to_async(self._save_selection)(request, source_ticket)
 
-        ticket_groups: list[TicketGroupVM] = []
-        for e in events:
-            if e.id not in tickets_by_event_id:
-                continue
-            ticket_groups.append(
-                TicketGroupVM(
-                    event=e,
-                    tickets=[TicketVM(ticket=t, checked=(t.ticket_uuid in checked_ticket_ids)) for t in
-                             tickets_by_event_id[e.id]],
-                )
-            )
-
-        # No-ticket Events: NUR dort anzeigen, wo es KEINE Tickets zur Email für dieses Event gibt
-        no_ticket_events: list[NoTicketEventVM] = []
-        for e in events:
-            if e.id in tickets_by_event_id:
-                continue
-            no_ticket_events.append(
-                NoTicketEventVM(event=e, checked=(e.id in checked_no_ticket_event_ids))
-            )
-
-        # Form choices (Validierung)
-        return ticket_groups, no_ticket_events, tickets, events
-
-    def get(self, request, ticket_uuid):
-        source_ticket = get_object_or_404(Ticket.objects.select_related("event"), ticket_uuid=ticket_uuid)
+    def _render_selection(self, request, source_ticket):
         email = source_ticket.email
         ticket_groups, no_ticket_events, _tickets, _events = self._build_viewmodel(email=email)
 
@@ -221,8 +340,7 @@ class TicketParticipationView(LoginRequiredMixin, View):
             "form": form,
         })
 
-    def post(self, request, ticket_uuid):
-        source_ticket = get_object_or_404(Ticket.objects.select_related("event"), ticket_uuid=ticket_uuid)
+    def _save_selection(self, request, source_ticket):
         email = source_ticket.email
         paid_at = timezone.localdate()
 
@@ -262,7 +380,7 @@ class TicketParticipationView(LoginRequiredMixin, View):
                     "email": email,
                     "name": source_ticket.name or email,
                     "paid_at": paid_at,
-                    "amount": Decimal("23.00"),
+                    "amount": price_for(KIND_TICKET),
                 }
             )
             upserted += 1
@@ -277,7 +395,7 @@ class TicketParticipationView(LoginRequiredMixin, View):
             if not e:
                 continue
 
-            p = Participant.objects.filter(event=e, email__iexact=email, ticket__isnull=True).first()
+            p = Participant.objects.filter(email_iexact(email), event=e, ticket__isnull=True).first()
             if p is None:
                 Participant.objects.create(
                     event=e,
@@ -285,13 +403,48 @@ class TicketParticipationView(LoginRequiredMixin, View):
                     name=source_ticket.name or email,
                     ticket=None,
                     paid_at=paid_at,
-                    amount=Decimal("28.00"),
+                    amount=price_for(KIND_NO_TICKET),
                 )
             upserted += 1
 
         messages.success(request, f"{upserted} Teilnahme(n) gespeichert.")
         return redirect(f"{self.success_url}")
 
+class TicketParticipationQuoteView(AsyncLoginRequiredMixin, View):
+    """
+    Preis (inkl. Serien-Rabatt) für die aktuelle Auswahl im Teilnahme-Formular (async).
+    GET-Parameter: tickets=<uuid> (mehrfach), no_ticket_events=<event_id> (mehrfach)
+    """
+
+    async def get(self, request, ticket_uuid):
+        source_ticket = await aget_object_or_404(Ticket, ticket_uuid=ticket_uuid)
+        summary = await sync_to_async(get_participation_summary)(source_ticket.email)
+
+        selectable_tickets = {
+            str(vm.ticket.ticket_uuid): vm.ticket
+            for group in summary.ticket_groups
+            for vm in group.tickets
+            if not vm.checked
+        }
+        selectable_event_ids = {str(vm.event.id) for vm in summary.no_ticket_events if not vm.checked}
+
+        items = [
+            QuoteItem(kind=KIND_TICKET, event_id=selectable_tickets[u].event_id)
+            for u in set(request.GET.getlist("tickets"))
+            if u in selectable_tickets
+        ]
+        items += [
+            QuoteItem(kind=KIND_NO_TICKET, event_id=int(e))
+            for e in set(request.GET.getlist("no_ticket_events"))
+            if e in selectable_event_ids
+        ]
+
+        q = await sync_to_async(quote_for_email)(
+            source_ticket.email, items=items, event_ids=[e.id for e in summary.events]
+        )
+        return JsonResponse(q.as_dict())
+
+
 class ParticipantMixin(LoginRequiredMixin):
     model = Ticket
     success_url = reverse_lazy("participants_list")
@@ -305,8 +458,9 @@ class ParticipantMixin(LoginRequiredMixin):
         })
         return context
 
-class ParticipantsListView(ListView, ParticipantMixin):
+class ParticipantsListView(ConditionalListMixin, LiveListMixin, ListView, ParticipantMixin):
     template_name = "participants/participants_list.html"
+    live_url_name = "participants_delta"
     paginate_by = 10
     model = Participant
 
@@ -359,6 +513,11 @@ class ParticipantsListView(ListView, ParticipantMixin):
 
         return context
 
+
+class ParticipantsDeltaView(LiveDeltaMixin, ParticipantsListView):
+    row_template = "participants/partials/participant_row.html"
+
+
 class ParticipantNoTicketCreateView(CreateView, LoginRequiredMixin):
     template_name = "participants/participant_create_no_ticket.html"
     model = Participant
@@ -397,96 +556,174 @@ class ParticipantNoTicketCreateView(CreateView, LoginRequiredMixin):
         return f"{reverse_lazy('participants_list')}?event={event_id}"
 
 
-class AnalyticsDashboardView(TemplateView):
+class EventAnomalyMixin(LoginRequiredMixin, RequireAdminRoleMixin):
+    """
+    Drill-down der Dashboard-Abweichungen für ein Event (nur Staff).
+    """
+
+    paginate_by = 25
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    @cached_property
+    def event(self) -> Event:
+        return get_object_or_404(Event, pk=self.kwargs["event_id"])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["event"] = self.event
+        context["cancel_url"] = reverse("analytics_dashboard")
+        return context
+
+
+class EventOrphansListView(EventAnomalyMixin, ListView):
+    template_name = "participants/orphans_list.html"
+
+    def get_queryset(self):
+        return anomalies.orphans(self.event.id)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["title_plural"] = "Zahler ohne Ticket"
+        return context
+
+
+class EventOrphansAutolinkView(EventAnomalyMixin, View):
+    """
+    POST: verknüpft die gewählten (oder alle) Zahler ohne Ticket mit passenden Tickets.
+    """
+
+    def post(self, request, event_id):
+        qs = Participant.objects.filter(event_id=self.event.id, ticket__isnull=True)
+        selected = request.POST.getlist("participant")
+        if selected:
+            qs = qs.filter(pk__in=selected)
+
+        stats = Participant.objects.autolink(qs)
+        if stats["linked"]:
+            messages.success(request, f"{stats['linked']} Teilnehmer mit Ticket verknüpft.")
+        if stats["unmatched"]:
+            messages.info(request, f"{stats['unmatched']} Teilnehmer ohne passendes Ticket.")
+        if not stats["linked"] and not stats["unmatched"]:
+            messages.warning(request, "Keine Teilnehmer verarbeitet.")
+
+        # zurück auf dieselbe Seite der Liste
+        url = reverse("event_orphans", args=[self.event.id])
+        if request.GET:
+            url = f"{url}?{request.GET.urlencode()}"
+        return redirect(url)
+
+
+class EventUnpaidTicketsListView(EventAnomalyMixin, ListView):
+    template_name = "tickets/unpaid_list.html"
+
+    def get_queryset(self):
+        return anomalies.unpaid(self.event.id)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["title_plural"] = "Tickets ohne Zahlung"
+        return context
+
+
+class AnalyticsDashboardView(LoginRequiredMixin, TemplateView):
+    """
+    Nur das Gerüst; KPIs, Tabelle und Charts lädt das Template parallel über die JSON-Endpoints.
+    """
+
     template_name = "analytics/dashboard.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["filter_form"] = DashboardFilterForm(self.request.GET or None)
+        return context
 
-        # 1. Globale KPIs
-        # Hier ist Aggregation sicher, da wir direkt auf Participant zugreifen
-        total_revenue = Participant.objects.aggregate(
-            sum=Coalesce(Sum('amount'), 0, output_field=DecimalField())
-        )['sum']
-
-        count_tickets = Ticket.objects.count()
-        count_participants = Participant.objects.count()
-
-        # --- RABATT LOGIK ---
-        total_events_count = Event.objects.count()
-        discount_volume = 0
-        eligible_count = 0
-
-        if total_events_count > 0:
-            full_series_participants = Participant.objects.values('email').annotate(
-                events_booked=Count('event', distinct=True)
-            ).filter(events_booked=total_events_count)
-
-            eligible_count = full_series_participants.count()
-            discount_volume = eligible_count * 23
-
-        adjusted_revenue = total_revenue - discount_volume
-        # --------------------
-
-        orphaned_participants = Participant.objects.filter(ticket__isnull=True).count()
-        unpaid_tickets = Ticket.objects.filter(participant__isnull=True).count()
-
-        # 2. Event-basierte Auswertung mit SUBQUERIES (Der Fix)
-        # Wir definieren isolierte Abfragen für jede Metrik, damit sie sich nicht multiplizieren.
-
-        # A) Subquery für Teilnehmer-Umsatz pro Event
-        revenue_subquery = Participant.objects.filter(
-            event=OuterRef('pk')
-        ).values('event').annotate(
-            total=Sum('amount')
-        ).values('total')
-
-        # B) Subquery für Teilnehmer-Anzahl
-        participants_subquery = Participant.objects.filter(
-            event=OuterRef('pk')
-        ).values('event').annotate(
-            cnt=Count('pk')
-        ).values('cnt')
-
-        # C) Subquery für Ticket-Anzahl
-        tickets_subquery = Ticket.objects.filter(
-            event=OuterRef('pk')
-        ).values('event').annotate(
-            cnt=Count('pk')
-        ).values('cnt')
-
-        # D) Hauptabfrage: Wir kleben die Subqueries an das Event
-        events_qs = Event.objects.annotate(
-            revenue=Coalesce(Subquery(revenue_subquery, output_field=DecimalField()), 0, output_field=DecimalField()),
-            participants_count=Coalesce(Subquery(participants_subquery), 0),
-            tickets_count=Coalesce(Subquery(tickets_subquery), 0)
-        ).order_by('-date')
-
-        # 3. Daten für Chart.js
-        chart_events = events_qs.order_by('date')
-
-        labels = [e.date.strftime('%d.%m.%Y') + f" ({e.name[:15]}...)" for e in chart_events]
-        data_revenue = [float(e.revenue) for e in chart_events]
-        data_tickets = [e.tickets_count for e in chart_events]
-        data_participants = [e.participants_count for e in chart_events]
 
-        context.update({
-            "kpi": {
-                "revenue": total_revenue,
-                "adjusted_revenue": adjusted_revenue,
-                "discount_volume": discount_volume,
-                "eligible_count": eligible_count,
-                "tickets": count_tickets,
-                "participants": count_participants,
-                "orphans": orphaned_participants,
-                "unpaid": unpaid_tickets,
-            },
-            "events": events_qs,
-            "chart_data": json.dumps({
-                "labels": labels,
-                "revenue": data_revenue,
-                "tickets": data_tickets,
-                "participants": data_participants
-            })
-        })
-        return context
\ No newline at end of file
+class DashboardSectionView(AsyncLoginRequiredMixin, View):
+    """
+    JSON-Abschnitt des Dashboards mit ETag (Daten-Stand); unverändert -> 304.
+    Async: das ETag kommt aus dem Versionsstand des Requests, erst die Berechnung
+    (Cache/ORM, synchron) läuft in einem Thread.
+
+    Unterklassen setzen `section` und implementieren `get_data(request) -> dict`.
+    """
+
+    section = None
+    # JSON-Endpoint: 403 statt Weiterleitung auf die Login-Seite
+    raise_exception = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.section or not callable(getattr(cls, "get_data", None)):
+            raise ImproperlyConfigured(f"{cls.__name__} braucht `section` und `get_data`.")
+
+    async def get(self, request, *args, **kwargs):
+        @condition(etag_func=lambda req: dashboard.section_etag(self.section, req))
+        async def respond(req):
+            return JsonResponse(await sync_to_async(self.get_data)(req))
+
+        response = await respond(request)
+        # Browser soll immer nachfragen (If-None-Match) statt blind zu cachen
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class DashboardKpisView(DashboardSectionView):
+    section = "kpis"
+
+    def get_data(self, request) -> dict:
+        return dashboard.kpis()
+
+
+class DashboardEventsView(DashboardSectionView):
+    section = "events"
+
+    def get_data(self, request) -> dict:
+        return {"events": dashboard.event_rows()}
+
+
+class DashboardChartsView(DashboardSectionView):
+    section = "charts"
+
+    def get_data(self, request) -> dict:
+        _form, filters = dashboard.resolve_filters(request.GET)
+        return {
+            "events": dashboard.event_chart(),
+            "timeseries": dashboard.timeseries(**filters),
+        }
+
+
+class SeasonReportView(LoginRequiredMixin, TemplateView):
+    """
+    Saison-Auswertung (Wiederkehrer, Kohorten, Umsatz-Split, Ticket-Konversion)
+    aus dem spaltenorientierten Analytics-Frame.
+    """
+
+    template_name = "analytics/season_report.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["report"] = analytics.get_frame().season_report()
+        return context
+
+
+class MetricsView(View):
+    """
+    Prometheus-Scrape (gfm.metrics). Mit settings.GFM_METRICS_TOKEN per
+    "Authorization: Bearer <token>", sonst nur für eingeloggte Staff-User.
+    """
+
+    def has_access(self, request) -> bool:
+        token = settings.GFM_METRICS_TOKEN
+        if token:
+            given = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            return hmac.compare_digest(given.encode(), token.encode())
+        return request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_access(request):
+            raise PermissionDenied
+        response = HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+        patch_cache_control(response, no_store=True)
+        return response
@@ -0,0 +1,234 @@
+document.addEventListener('DOMContentLoaded', function() {
+
+    // Abschnitte werden parallel geladen; der Browser schickt If-None-Match mit,
+    // unveränderte Abschnitte kommen als 304 aus dem HTTP-Cache.
+    const root = document.getElementById('dashboard');
+    const query = window.location.search;
+
+    function getJSON(url) {
+        return fetch(url, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(`${url}: ${response.status}`);
+                }
+                return response.json();
+            });
+    }
+
+    function formatEuro(value) {
+        return Number(value).toLocaleString('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+    }
+
+    function formatDate(iso) {
+        const [y, m, d] = iso.split('-');
+        return `${d}.${m}.${y}`;
+    }
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    // --- KPIs ---
+    function renderKpis(kpi) {
+        document.querySelectorAll('[data-kpi]').forEach(function(node) {
+            const value = kpi[node.dataset.kpi];
+            node.textContent = node.dataset.format === 'euro' ? formatEuro(value) : value;
+        });
+        if (Number(kpi.discount_volume) > 0) {
+            document.getElementById('kpi-discount').style.display = 'block';
+            document.getElementById('kpi-discount-title').title =
+                `${kpi.eligible_count} Personen haben alle Events besucht`;
+        }
+    }
+
+    // --- Tabelle pro Veranstaltung ---
+    function statusBadge(row) {
+        if (row.tickets === 0 && row.participants === 0) {
+            return el('span', 'badge bg-secondary', 'Leer');
+        }
+        if (row.participants < row.tickets) {
+            const badge = el('span', 'badge bg-warning text-dark', 'Offen');
+            badge.title = 'Mehr Tickets als Zahlungen';
+            return badge;
+        }
+        if (row.participants > row.tickets) {
+            const badge = el('span', 'badge bg-danger', 'Prüfen');
+            badge.title = 'Mehr Zahlungen als Tickets (Fehler?)';
+            return badge;
+        }
+        const badge = el('span', 'badge bg-success', ' OK');
+        badge.prepend(el('i', 'bi bi-check-lg'));
+        return badge;
+    }
+
+    function renderEvents(data) {
+        const tbody = document.getElementById('dashboard-events');
+        tbody.replaceChildren();
+
+        if (data.events.length === 0) {
+            const tr = el('tr');
+            const td = el('td', 'text-center py-4 text-muted', 'Keine Veranstaltungen gefunden.');
+            td.colSpan = 6;
+            tr.append(td);
+            tbody.append(tr);
+            return;
+        }
+
+        data.events.forEach(function(row) {
+            const tr = el('tr');
+            tr.append(el('td', 'text-nowrap', formatDate(row.date)));
+            tr.append(el('td', 'fw-bold', row.name));
+
+            const tickets = el('td', 'text-center');
+            tickets.append(el('span', 'badge bg-light text-dark border', row.tickets));
+            tr.append(tickets);
+
+            const participants = el('td', 'text-center');
+            participants.append(el('span', 'badge bg-primary bg-opacity-10 text-primary border border-primary', row.participants));
+            tr.append(participants);
+
+            tr.append(el('td', 'text-end font-monospace fw-bold text-success', `${formatEuro(row.revenue)} €`));
+
+            const status = el('td', 'text-center');
+            status.append(statusBadge(row));
+            // Drill-down zu den betroffenen Datensätzen
+            [[row.orphans, row.orphans_url, 'ohne Ticket'], [row.unpaid, row.unpaid_url, 'unbezahlt']]
+                .forEach(function([count, url, label]) {
+                    if (count > 0) {
+                        const link = el('a', 'd-block small', `${count} ${label}`);
+                        link.href = url;
+                        status.append(link);
+                    }
+                });
+            tr.append(status);
+
+            tbody.append(tr);
+        });
+    }
+
+    // --- Charts ---
+    function renderCharts(data) {
+        const chartData = data.events;
+        const timeseries = data.timeseries;
+
+        new Chart(document.getElementById('analyticsChart').getContext('2d'), {
+            type: 'bar',
+            data: {
+                labels: chartData.labels,
+                datasets: [
+                    {
+                        label: 'Umsatz (€)',
+                        data: chartData.revenue,
+                        backgroundColor: 'rgba(25, 135, 84, 0.2)', // Success color transparent
+                        borderColor: 'rgba(25, 135, 84, 1)',
+                        borderWidth: 1,
+                        yAxisID: 'y',
+                        order: 2
+                    },
+                    {
+                        label: 'Teilnehmer (Bezahlt)',
+                        data: chartData.participants,
+                        type: 'line',
+                        borderColor: 'rgba(13, 110, 253, 1)', // Primary color
+                        backgroundColor: 'rgba(13, 110, 253, 1)',
+                        borderWidth: 2,
+                        tension: 0.3,
+                        pointRadius: 4,
+                        yAxisID: 'y1',
+                        order: 1
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                interaction: {
+                    mode: 'index',
+                    intersect: false,
+                },
+                scales: {
+                    y: {
+                        type: 'linear',
+                        display: true,
+                        position: 'left',
+                        title: { display: true, text: 'Umsatz (€)' },
+                        beginAtZero: true
+                    },
+                    y1: {
+                        type: 'linear',
+                        display: true,
+                        position: 'right',
+                        grid: { drawOnChartArea: false },
+                        title: { display: true, text: 'Anzahl Personen' },
+                        beginAtZero: true
+                    }
+                }
+            }
+        });
+
+        if (timeseries.checkin_event) {
+            const event = timeseries.checkin_event;
+            document.getElementById('checkin-event').textContent = `· ${event.name} (${formatDate(event.date)})`;
+        }
+
+        new Chart(document.getElementById('revenueCumulativeChart').getContext('2d'), {
+            type: 'line',
+            data: {
+                labels: timeseries.revenue_labels,
+                datasets: [{
+                    label: 'Umsatz kumuliert (€)',
+                    data: timeseries.revenue_cumulative,
+                    borderColor: 'rgba(25, 135, 84, 1)',
+                    backgroundColor: 'rgba(25, 135, 84, 0.1)',
+                    fill: true,
+                    tension: 0.2
+                }]
+            },
+            options: {
+                responsive: true,
+                scales: { y: { beginAtZero: true } }
+            }
+        });
+
+        new Chart(document.getElementById('checkinChart').getContext('2d'), {
+            type: 'bar',
+            data: {
+                labels: timeseries.checkin_labels,
+                datasets: [
+                    {
+                        label: 'Check-ins',
+                        data: timeseries.checkins,
+                        backgroundColor: 'rgba(13, 110, 253, 0.5)',
+                        borderColor: 'rgba(13, 110, 253, 1)',
+                        borderWidth: 1,
+                        yAxisID: 'y'
+                    },
+                    {
+                        label: 'Umsatz (€)',
+                        data: timeseries.checkin_revenue,
+                        type: 'line',
+                        borderColor: 'rgba(25, 135, 84, 1)',
+                        backgroundColor: 'rgba(25, 135, 84, 1)',
+                        tension: 0.3,
+                        yAxisID: 'y1'
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                interaction: { mode: 'index', intersect: false },
+                scales: {
+                    y: { beginAtZero: true, position: 'left', title: { display: true, text: 'Check-ins' } },
+                    y1: { beginAtZero: true, position: 'right', grid: { drawOnChartArea: false }, title: { display: true, text: 'Umsatz (€)' } }
+                }
+            }
+        });
+    }
+
+    // Jeder Abschnitt rendert, sobald er da ist (kein Warten auf den langsamsten)
+    getJSON(root.dataset.kpisUrl).then(renderKpis).catch(console.error);
+    getJSON(root.dataset.eventsUrl).then(renderEvents).catch(console.error);
+    getJSON(root.dataset.chartsUrl + query).then(renderCharts).catch(console.error);
+});
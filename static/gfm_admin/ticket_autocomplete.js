@@ -0,0 +1,20 @@
+'use strict';
+{
+    // Ticket-Autocomplete im Participant-Admin: gewähltes Event mitschicken,
+    // damit der Server nur Tickets dieses Events durchsucht (TicketAdmin._autocomplete_results).
+    const $ = django.jQuery;
+
+    $.ajaxPrefilter(function(options) {
+        if (typeof options.data !== 'string') {
+            return;
+        }
+        const params = new URLSearchParams(options.data);
+        if (params.get('model_name') !== 'participant' || params.get('field_name') !== 'ticket') {
+            return;
+        }
+        const eventField = document.getElementById('id_event');
+        if (eventField && eventField.value) {
+            options.data += '&event=' + encodeURIComponent(eventField.value);
+        }
+    });
+}
@@ -0,0 +1,87 @@
+document.addEventListener('DOMContentLoaded', function () {
+
+    // Live-Aktualisierung der Listen: fragt den Delta-Endpoint regelmäßig nach
+    // geänderten Zeilen (seit dem Wasserzeichen) und tauscht sie auf der Seite aus.
+    // Solange sich nichts ändert, antwortet der Server mit 304 (ETag).
+    const list = document.querySelector('[data-live-url]');
+    if (!list) {
+        return;
+    }
+
+    const INTERVAL = 1000;
+    const total = Number(list.dataset.total);
+    let watermark = list.dataset.watermark;
+    let etag = null;
+    // Der Server liefert Zeilen aus dem Überlappungsfenster wiederholt: nur neue Stände einsetzen
+    const versions = new Map();
+
+    function showReloadHint() {
+        if (document.getElementById('live-reload')) {
+            return;
+        }
+        // Neue/gelöschte Zeilen verschieben Sortierung und Seiten -> neu laden
+        const hint = document.createElement('a');
+        hint.id = 'live-reload';
+        hint.href = window.location.href;
+        hint.className = 'alert alert-info d-block mb-3 text-decoration-none';
+        hint.innerHTML = '<i class="bi bi-arrow-clockwise me-1"></i> Liste hat sich geändert – neu laden';
+        list.closest('.card').before(hint);
+    }
+
+    function apply(delta) {
+        for (const row of delta.rows) {
+            if (versions.get(row.id) === row.version) {
+                continue;
+            }
+            versions.set(row.id, row.version);
+            // Zeilen auf anderen Seiten ignorieren
+            const item = list.querySelector(`[data-row-id="${row.id}"]`);
+            if (item) {
+                item.innerHTML = row.html;
+            }
+        }
+        if (delta.reload || delta.total !== total) {
+            showReloadHint();
+        }
+        watermark = delta.watermark;
+    }
+
+    function poll() {
+        if (document.hidden) {
+            setTimeout(poll, INTERVAL);
+            return;
+        }
+
+        const url = new URL(list.dataset.liveUrl, window.location.href);
+        url.searchParams.set('since', watermark);
+        const headers = {'Accept': 'application/json'};
+        if (etag) {
+            headers['If-None-Match'] = etag;
+        }
+
+        fetch(url, {headers: headers, cache: 'no-store'})
+            .then(function (response) {
+                if (response.status === 304) {
+                    return null;
+                }
+                if (!response.ok) {
+                    throw new Error(`Live-Aktualisierung: HTTP ${response.status}`);
+                }
+                etag = response.headers.get('ETag');
+                return response.json();
+            })
+            .then(function (delta) {
+                if (delta) {
+                    apply(delta);
+                }
+                setTimeout(poll, INTERVAL);
+            })
+            .catch(function (error) {
+                // Netz weg oder Sitzung abgelaufen: seltener weiter versuchen
+                console.error(error);
+                setTimeout(poll, INTERVAL * 10);
+            });
+    }
+
+    setTimeout(poll, INTERVAL);
+});
@@ -1,138 +1,82 @@
 document.addEventListener('DOMContentLoaded', function() {
-    
-    const PRICE_TICKET = 23;
-    const PRICE_NO_TICKET = 28;
-    
-    const form = document.querySelector('form');
+
+    // Preise und Rabatte kommen vom Server (gfm.pricing), hier nur Anzeige
+    const form = document.getElementById('participation-form');
+    const quoteUrl = form.dataset.quoteUrl;
     const priceContainer = document.getElementById('price-container');
     const priceDisplay = document.getElementById('total-price');
     const discountBadge = document.getElementById('discount-badge');
     const detailsDisplay = document.getElementById('price-details');
 
-    function calculateTotal() {
-        
-        let currentTotal = 0;
-        let currentSelection = []; 
-        let allEventIds = new Set(); 
-        let participationCounts = {}; 
-
-        // Hilfsfunktion
-        function addParticipation(eventId, isNewSelection, price = 0, source = "unknown") {
-            if (!eventId) {
-                return;
-            }
-            
-            allEventIds.add(eventId);
-            participationCounts[eventId] = (participationCounts[eventId] || 0) + 1;
-
-            if (isNewSelection) {
-                currentTotal += price;
-                currentSelection.push(price);
-            } else {
-            }
-        }
-
-        // 1. BEREITS GEBUCHTE (LOCKED) ITEMS
-        const lockedItems = document.querySelectorAll('.touch-friendly-locked');
-        
-        lockedItems.forEach((el, index) => {
-            // Wir prüfen explizit auf das Attribut
-            const eId = el.getAttribute('data-event-id');
-            if(!eId) {
-            }
-            addParticipation(eId, false, 0, "locked-item");
-        });
+    let quoteController = null;
 
-        // 2. NEUE TICKETS
-        const ticketInputs = document.querySelectorAll('input[name^="group_"]');
-        ticketInputs.forEach(input => {
-            const parts = input.name.split('_');
-            const eId = parts.length > 1 ? parts[1] : null;
-            
-            // Event ID registrieren (auch wenn nicht gewählt)
-            if(eId) allEventIds.add(eId); 
-
-            if (input.checked) {
-                addParticipation(eId, true, PRICE_TICKET, "ticket-checkbox");
-            }
-        });
+    function formatEuro(value) {
+        const n = Number(value);
+        return Number.isInteger(n) ? String(n) : n.toFixed(2).replace('.', ',');
+    }
 
-        // 3. NEUE OHNE TICKET
-        const noTicketInputs = document.querySelectorAll('input[name="no_ticket_events_dynamic"]');
-        noTicketInputs.forEach(input => {
-            const eId = input.value;
-            if(eId) allEventIds.add(eId);
+    function renderQuote(quote) {
+        const count = quote.items.length;
 
-            if (input.checked) {
-                addParticipation(eId, true, PRICE_NO_TICKET, "no-ticket-checkbox");
-            }
-        });
+        if (count === 0) {
+            priceContainer.style.display = 'none';
+            return;
+        }
 
-        // --- ZWISCHENSTAND LOGGEN ---
-        
-        // --- RABATT LOGIK ---
-        let participatedInAll = true;
-        let doubleParticipatedInAll = true;
-        const totalEventsCount = allEventIds.size;
+        priceContainer.style.display = 'block';
+        priceDisplay.textContent = formatEuro(quote.total);
 
-        if (totalEventsCount === 0) {
-            participatedInAll = false;
-            doubleParticipatedInAll = false;
+        if (Number(quote.discount) > 0) {
+            discountBadge.style.display = 'inline-block';
+            discountBadge.textContent = quote.discount_label;
+            const lockedCount = document.querySelectorAll('.touch-friendly-locked').length;
+            const lockedText = lockedCount > 0 ? ` (+${lockedCount} bereits gebucht)` : '';
+            detailsDisplay.textContent = `Regulär: ${formatEuro(quote.regular)} € - Rabatt: ${formatEuro(quote.discount)} € ${lockedText}`;
         } else {
-            for (let id of allEventIds) {
-                const count = participationCounts[id] || 0;
-                if (count < 1) {
-                    participatedInAll = false;
-                }
-                if (count < 2) {
-                    doubleParticipatedInAll = false;
-                    // Nur loggen, wenn wir überhaupt Chance auf Doppelrabatt hätten
-                    //
-                }
-            }
+            discountBadge.style.display = 'none';
+            detailsDisplay.textContent = `${count} Positionen gewählt`;
         }
+    }
 
+    function calculateTotal() {
+        const params = new URLSearchParams();
 
-        let discountAmount = 0;
-        let discountText = "";
-
-        currentSelection.sort((a, b) => a - b);
+        // 1. NEUE TICKETS
+        document.querySelectorAll('input[name^="group_"]:checked').forEach(input => {
+            params.append('tickets', input.value);
+        });
 
-        if (currentSelection.length > 0) {
-            if (doubleParticipatedInAll) {
-                let itemsToDiscount = Math.min(currentSelection.length, 2);
-                for(let i=0; i<itemsToDiscount; i++) {
-                    discountAmount += currentSelection[i];
-                }
-                discountText = "Doppel-Bonus: 2 Plätze gratis!";
+        // 2. NEUE OHNE TICKET
+        document.querySelectorAll('input[name="no_ticket_events_dynamic"]:checked').forEach(input => {
+            params.append('no_ticket_events', input.value);
+        });
 
-            } else if (participatedInAll) {
-                discountAmount = currentSelection[0];
-                discountText = "Serien-Bonus: 1x gratis!";
-            } else {
-            }
+        if (![...params.keys()].length) {
+            renderQuote({items: []});
+            return;
         }
 
-        const finalPrice = currentTotal - discountAmount;
-
-        // --- ANZEIGE UPDATEN ---
-        if (currentSelection.length > 0) {
-            priceContainer.style.display = 'block';
-            priceDisplay.textContent = finalPrice;
-            
-            if (discountAmount > 0) {
-                discountBadge.style.display = 'inline-block';
-                discountBadge.textContent = discountText;
-                const lockedCount = lockedItems.length;
-                const lockedText = lockedCount > 0 ? ` (+${lockedCount} bereits gebucht)` : '';
-                detailsDisplay.textContent = `Regulär: ${currentTotal} € - Rabatt: ${discountAmount} € ${lockedText}`;
-            } else {
-                discountBadge.style.display = 'none';
-                detailsDisplay.textContent = `${currentSelection.length} Positionen gewählt`;
-            }
-        } else {
-            priceContainer.style.display = 'none';
+        // Nur die letzte Anfrage zählt
+        if (quoteController) {
+            quoteController.abort();
         }
+        quoteController = new AbortController();
+
+        fetch(`${quoteUrl}?${params.toString()}`, {
+            headers: {'Accept': 'application/json'},
+            signal: quoteController.signal,
+        })
+            .then(response => response.ok ? response.json() : Promise.reject(response.status))
+            .then(renderQuote)
+            .catch(err => {
+                if (err && err.name === 'AbortError') {
+                    return;
+                }
+                priceContainer.style.display = 'block';
+                priceDisplay.textContent = '?';
+                discountBadge.style.display = 'none';
+                detailsDisplay.textContent = 'Preis konnte nicht berechnet werden.';
+            });
     }
 
     let isDirty = false;
@@ -201,5 +145,4 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    setTimeout(calculateTotal, 500);
 });
\ No newline at end of file
@@ -1,3 +1,4 @@
+# collectstatic schreibt gehashte Dateien + .gz/.br (gfm.storage, nginx-Konfiguration siehe README)
 cd /srv/django/gfm && \
 source .venv/bin/activate && \
 git fetch origin && git checkout main && git pull && \